@@ -0,0 +1,122 @@
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from creator import Puzzle
+from solver import newSolvePuzzle, searchSolvePuzzle
+
+
+def trialSeed(seed, pieceSize, puzzleSize, nonSquare, trial):
+  """
+  Derives the seed of one trial, the same inputs always give the same seed
+
+  Parameters
+  seed: integer, seed of the whole batch
+  pieceSize: integer, number of pixels in length/width of piece
+  puzzleSize: integer, number of pieces in length, width of puzzle
+  nonSquare: boolean, whether any empty coordinates throughout puzzle
+  trial: integer, number of the trial within its combination of sizes
+
+  Return
+  integer, seed of the trial
+  """
+  key = str(seed) + ":" + str(pieceSize) + ":" + str(puzzleSize) + ":" + str(nonSquare) + ":" + str(trial)
+  return random.Random(key).getrandbits(32)
+
+def trialGrid(pieceSizes, puzzleSizes, nonSquares, trials, seed=0, search=False, maxNodes=1000000):
+  """
+  Lists every trial of a parameter grid
+
+  Parameters
+  pieceSizes: list, piece sizes to try
+  puzzleSizes: list, puzzle sizes to try
+  nonSquares: list, nonSquare values to try
+  trials: integer, number of trials for every combination
+  seed: integer, seed of the whole batch
+  search: boolean, backtrack over non-unique edges instead of giving up
+  maxNodes: integer, most placements each search tries
+
+  Return
+  list, dictionaries describing each trial
+  """
+  grid = []
+  for pieceSize in pieceSizes:
+    for puzzleSize in puzzleSizes:
+      for nonSquare in nonSquares:
+        for trial in range(trials):
+          grid.append({"pieceSize": pieceSize, "puzzleSize": puzzleSize, "nonSquare": nonSquare, "trial": trial,
+                       "seed": trialSeed(seed, pieceSize, puzzleSize, nonSquare, trial), "search": search,
+                       "maxNodes": maxNodes})
+  return grid
+
+def runTrial(trial):
+  """
+  Creates and solves one puzzle
+
+  Parameters
+  trial: dictionary, pieceSize, puzzleSize, nonSquare and seed of the trial (see trialGrid)
+
+  Return
+  dictionary, the trial with its success, number of pieces and times in seconds
+  """
+  start = time.perf_counter()
+  puzzle = Puzzle(pieceSize=trial["pieceSize"], puzzleSize=trial["puzzleSize"], nonSquare=trial["nonSquare"], seed=trial["seed"])
+  created = time.perf_counter()
+  if trial["search"] == True:
+    pieceByLocation, success = searchSolvePuzzle(puzzle=puzzle, maxNodes=trial["maxNodes"])
+  else:
+    pieceByLocation, success = newSolvePuzzle(puzzle=puzzle)
+  solved = time.perf_counter()
+  result = dict(trial)
+  result["success"] = success
+  result["pieces"] = sum(1 for piece in puzzle.scrambledPieces if piece.empty == False)
+  result["createTime"] = created - start
+  result["solveTime"] = solved - created
+  return result
+
+def runBatch(grid, path, workers=None):
+  """
+  Runs trials across a pool of processes, writing each result to a JSON lines file as soon as it completes
+
+  Parameters
+  grid: list, dictionaries describing each trial (see trialGrid)
+  path: string, path to output JSON lines file
+  workers: integer, number of processes (default is the number of cores)
+
+  Return
+  integer, number of successful solves
+  """
+  successes = 0
+  with open(path, "w") as out, ProcessPoolExecutor(max_workers=workers) as pool:
+    futures = [pool.submit(runTrial, trial) for trial in grid]
+    for future in as_completed(futures):
+      result = future.result()
+      if result["success"] == True:
+        successes += 1
+      out.write(json.dumps(result) + "\n")
+      out.flush()
+  return successes
+
+def main(args=None):
+  parser = argparse.ArgumentParser(description="Generates and solves many puzzles in parallel")
+  parser.add_argument("--piece-sizes", type=int, nargs="+", default=[20], help="piece sizes to try")
+  parser.add_argument("--puzzle-sizes", type=int, nargs="+", default=[20], help="puzzle sizes to try")
+  parser.add_argument("--non-square", type=int, nargs="+", choices=[0, 1], default=[0], help="nonSquare values to try")
+  parser.add_argument("--trials", type=int, default=10, help="number of trials for every combination")
+  parser.add_argument("--seed", type=int, default=0, help="seed of the whole batch")
+  parser.add_argument("--search", action="store_true", help="backtrack over non-unique edges instead of giving up")
+  parser.add_argument("--max-nodes", type=int, default=1000000, help="most placements each search tries")
+  parser.add_argument("--workers", type=int, default=None, help="number of processes (default is the number of cores)")
+  parser.add_argument("--output", default="batch_results.jsonl", help="path to output JSON lines file")
+  options = parser.parse_args(args)
+  grid = trialGrid(pieceSizes=options.piece_sizes, puzzleSizes=options.puzzle_sizes,
+                   nonSquares=[value == 1 for value in options.non_square], trials=options.trials, seed=options.seed,
+                   search=options.search, maxNodes=options.max_nodes)
+  start = time.perf_counter()
+  successes = runBatch(grid=grid, path=options.output, workers=options.workers)
+  print("Solved " + str(successes) + " of " + str(len(grid)) + " puzzles in " + str(round(time.perf_counter() - start, 2)) + " seconds")
+
+
+if __name__ == "__main__":
+  main()
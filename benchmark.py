@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from creator import Puzzle
+from solver import IncrementalSolver, misplacedNeighbors, newSolvePuzzle, placeOnCanvas
+
+
+phases = ["generate", "solve", "place", "render", "incremental"]
+
+
+def runPipeline(pieceSize, puzzleSize, nonSquare, seed, path):
+  """
+  Generates, solves and renders one puzzle, timing every phase. The same puzzle is also fed piece by piece to an
+  IncrementalSolver, whose assemblies are checked against the grid the puzzle was made in
+
+  Parameters
+  pieceSize: integer, number of pixels in length/width of piece
+  puzzleSize: integer, number of pieces in length, width of puzzle
+  nonSquare: boolean, whether any empty coordinates throughout puzzle
+  seed: integer, seed of the puzzle
+  path: string, path to output png of the solved puzzle
+
+  Return
+  dictionary, seconds taken by every phase that ran
+  boolean, solved or not
+  integer, neighbors the incremental solver misplaced (see solver.py misplacedNeighbors)
+  """
+  times = {}
+  start = time.perf_counter()
+  puzzle = Puzzle(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=nonSquare, seed=seed)
+  times["generate"] = time.perf_counter() - start
+  start = time.perf_counter()
+  pieceByLocation, success = newSolvePuzzle(puzzle=puzzle)
+  times["solve"] = time.perf_counter() - start
+  if success == True:
+    start = time.perf_counter()
+    final = placeOnCanvas(pieces=pieceByLocation, pieceSize=pieceSize)
+    times["place"] = time.perf_counter() - start
+    start = time.perf_counter()
+    final.displaySolved(path=path, type="answer")
+    times["render"] = time.perf_counter() - start
+  puzzle = Puzzle(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=nonSquare, seed=seed)  # the solve rotated the first one
+  start = time.perf_counter()
+  incremental = IncrementalSolver()
+  for piece in puzzle.scrambledPieces:
+    incremental.addPiece(piece=piece)
+  times["incremental"] = time.perf_counter() - start
+  return times, success, misplacedNeighbors(puzzle=puzzle, assemblies=incremental.clusters())
+
+def peakMemory(pieceSize, puzzleSize, nonSquare, seed, path):
+  """
+  Measures the most memory allocated by the pipeline (see runPipeline), kept apart from timing runs because tracing slows allocation
+
+  Parameters
+  pieceSize: integer, number of pixels in length/width of piece
+  puzzleSize: integer, number of pieces in length, width of puzzle
+  nonSquare: boolean, whether any empty coordinates throughout puzzle
+  seed: integer, seed of the puzzle
+  path: string, path to output png of the solved puzzle
+
+  Return
+  integer, peak bytes allocated
+  """
+  tracemalloc.start()
+  try:
+    runPipeline(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=nonSquare, seed=seed, path=path)
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+def configurationName(pieceSize, puzzleSize, nonSquare):
+  """
+  Names a configuration so results and baselines can be matched
+
+  Parameters
+  pieceSize: integer, number of pixels in length/width of piece
+  puzzleSize: integer, number of pieces in length, width of puzzle
+  nonSquare: boolean, whether any empty coordinates throughout puzzle
+
+  Return
+  string, name of configuration
+  """
+  return "pieceSize=" + str(pieceSize) + ",puzzleSize=" + str(puzzleSize) + ",nonSquare=" + str(nonSquare)
+
+def runBenchmarks(pieceSizes, puzzleSizes, nonSquares, repeats, seed=0):
+  """
+  Sweeps every configuration, recording median wall time of every phase, peak memory, success rate and the most
+  neighbors the incremental solver misplaced
+
+  Parameters
+  pieceSizes: list, piece sizes to try
+  puzzleSizes: list, puzzle sizes to try
+  nonSquares: list, nonSquare values to try
+  repeats: integer, number of puzzles for every configuration
+  seed: integer, seed of the first puzzle, later puzzles count up from it
+
+  Return
+  dictionary, configuration name to results
+  """
+  results = {}
+  with tempfile.TemporaryDirectory() as directory:   # renders are only written to be timed, nothing is kept
+    path = os.path.join(directory, "benchmark.png")
+    for pieceSize in pieceSizes:
+      for puzzleSize in puzzleSizes:
+        for nonSquare in nonSquares:
+          times = {phase: [] for phase in phases}
+          successes = 0
+          misplaced = 0
+          for repeat in range(repeats):
+            runTimes, success, runMisplaced = runPipeline(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=nonSquare, seed=seed + repeat, path=path)
+            for phase in runTimes:
+              times[phase].append(runTimes[phase])
+            if success == True:
+              successes += 1
+            misplaced = max(misplaced, runMisplaced)
+          name = configurationName(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=nonSquare)
+          results[name] = {"pieceSize": pieceSize, "puzzleSize": puzzleSize, "nonSquare": nonSquare, "repeats": repeats,
+                           "successRate": successes / repeats, "misplaced": misplaced,
+                           "peakMemory": peakMemory(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=nonSquare, seed=seed, path=path),
+                           "times": {phase: statistics.median(times[phase]) for phase in phases if len(times[phase]) > 0}}
+          print(name + " " + json.dumps(results[name]["times"]), file=sys.stderr)
+  return results
+
+def compareToBaseline(results, baseline, tolerance, minSeconds=0.005):
+  """
+  Finds phases that got slower, or configurations that use more memory, solve less often or misplace more neighbors, than a stored baseline
+
+  Parameters
+  results: dictionary, results of runBenchmarks
+  baseline: dictionary, earlier results of runBenchmarks
+  tolerance: float, fraction a measurement may grow before it counts as a regression
+  minSeconds: float, smallest slowdown that counts as a regression, keeps timer noise on quick phases out
+
+  Return
+  list, description of every regression
+  """
+  regressions = []
+  for name in results:
+    if name not in baseline:
+      continue
+    for phase, seconds in results[name]["times"].items():
+      before = baseline[name]["times"].get(phase)
+      if before is not None and seconds > before * (1 + tolerance) and seconds - before > minSeconds:
+        regressions.append(name + " " + phase + ": " + str(round(before, 4)) + "s -> " + str(round(seconds, 4)) + "s")
+    if results[name]["peakMemory"] > baseline[name]["peakMemory"] * (1 + tolerance):
+      regressions.append(name + " peakMemory: " + str(baseline[name]["peakMemory"]) + " -> " + str(results[name]["peakMemory"]))
+    if results[name]["successRate"] < baseline[name]["successRate"]:
+      regressions.append(name + " successRate: " + str(baseline[name]["successRate"]) + " -> " + str(results[name]["successRate"]))
+    if results[name]["misplaced"] > baseline[name].get("misplaced", 0):
+      regressions.append(name + " misplaced: " + str(baseline[name].get("misplaced", 0)) + " -> " + str(results[name]["misplaced"]))
+  return regressions
+
+def main(args=None):
+  parser = argparse.ArgumentParser(description="Times generation, solving and rendering across puzzle and piece sizes")
+  parser.add_argument("--piece-sizes", type=int, nargs="+", default=[10, 20], help="piece sizes to try")
+  parser.add_argument("--puzzle-sizes", type=int, nargs="+", default=[10, 20, 40], help="puzzle sizes to try")
+  parser.add_argument("--non-square", type=int, nargs="+", choices=[0, 1], default=[0, 1], help="nonSquare values to try")
+  parser.add_argument("--repeats", type=int, default=5, help="number of puzzles for every configuration")
+  parser.add_argument("--seed", type=int, default=0, help="seed of the first puzzle")
+  parser.add_argument("--output", default=None, help="path to output JSON results (default prints them)")
+  parser.add_argument("--baseline", default=None, help="path to JSON results to compare against")
+  parser.add_argument("--tolerance", type=float, default=0.25, help="fraction a measurement may grow before it counts as a regression")
+  parser.add_argument("--min-seconds", type=float, default=0.005, help="smallest slowdown that counts as a regression")
+  options = parser.parse_args(args)
+  results = runBenchmarks(pieceSizes=options.piece_sizes, puzzleSizes=options.puzzle_sizes,
+                          nonSquares=[value == 1 for value in options.non_square], repeats=options.repeats, seed=options.seed)
+  if options.output is None:
+    print(json.dumps(results, indent=2))
+  else:
+    with open(options.output, "w") as out:
+      json.dump(results, out, indent=2)
+  if options.baseline is not None:
+    with open(options.baseline) as baselineFile:
+      regressions = compareToBaseline(results=results, baseline=json.load(baselineFile), tolerance=options.tolerance,
+                                      minSeconds=options.min_seconds)
+    for regression in regressions:
+      print("Regression: " + regression, file=sys.stderr)
+    if len(regressions) > 0:
+      return 1
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
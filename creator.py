@@ -1,24 +1,33 @@
+import json
+import os
 import random
+import numpy as np
 from PIL import Image
 
 
-def combineConstraints(c1, c2, c3, c4):
+emptyPixel = -128  # value of every pixel in an empty piece
+hashWeights = {}   # powers of 3 used by edgeHash, by edge length
+
+
+def edgeHash(edges):
   """
-  Aggregates all building constraints from edges
+  Hashes whole edges by reading their values as digits of a base 3 number, which is exact for pieces up to 40 pixels
+  and wraps around (still spreading edges out) for larger ones. Unlike the sum of an edge, different edges rarely share a hash
 
   Parameters
-  c1,c2,c3,c4: dictionaries, edge building constraints
+  edges: array, values along edges in clockwise order, edge along the last axis
 
   Return
-  dictionary, all edge building constraints
+  array, unsigned 64 bit hash of every edge
   """
-  for element in c2:
-    c1[element] = c2[element]
-  for element in c3:
-    c1[element] = c3[element]
-  for element in c4:
-    c1[element] = c4[element]
-  return c1
+  edges = np.asarray(edges)
+  size = edges.shape[-1]
+  if size not in hashWeights:
+    weights = np.full(size, 3, dtype=np.uint64)
+    weights[0] = 1
+    hashWeights[size] = np.cumprod(weights, dtype=np.uint64)   # powers of 3, array arithmetic wraps around silently
+  return (edges.astype(np.int64) + 1).astype(np.uint64) @ hashWeights[size]
+
 
 def surroundingCoordinates(x,y,max):
   """
@@ -44,9 +53,62 @@ def surroundingCoordinates(x,y,max):
   return coords
 
 
+def substream(seed, *keys):
+  """
+  Derives an independent random number generator for one part of a puzzle, the same seed and keys always give the same stream
+
+  Parameters
+  seed: integer, seed of the whole puzzle, None for the random module
+  keys: values naming the part, such as the coordinate of a piece
+
+  Return
+  random number generator, random.Random or the random module when seed is None
+  """
+  if seed is None:
+    return random
+  return random.Random(":".join(str(key) for key in (seed,) + keys))
+
+
+def generateLayout(puzzleSize, nonSquare=False, rng=random):
+  """
+  Grows the shape of a puzzle outward from a random starting coordinate.
+  Every unused coordinate next to the shape is equally likely to be picked next
+
+  Parameters
+  puzzleSize: integer, number of pieces in length, width of puzzle
+  nonSquare: boolean, whether any empty coordinates throughout puzzle
+  rng: random number generator with randrange, the random module by default
+
+  Return
+  list, lists of 1 (piece) or "-" (empty) for every coordinate
+  """
+  layout = []
+  for vertical in range(puzzleSize):
+    layout.append(["-"] * puzzleSize)
+  vertical = rng.randrange(0, puzzleSize)
+  horizontal = rng.randrange(0, puzzleSize)
+  frontier = [(horizontal, vertical)]   # coordinates next to the shape that have not been used yet
+  discovered = {(horizontal, vertical)}
+  while len(frontier) > 0:
+    pick = rng.randrange(0, len(frontier))
+    coordinate = frontier[pick]
+    frontier[pick] = frontier[-1]   # swap with the last coordinate so removal is constant time
+    frontier.pop()
+    if nonSquare == True and len(discovered) > 1:
+      skipPiece = rng.randrange(0, 3)
+      if skipPiece == 1:
+        continue
+    layout[coordinate[1]][coordinate[0]] = 1
+    for coor in surroundingCoordinates(coordinate[0], coordinate[1], puzzleSize - 1):
+      if coor not in discovered:
+        discovered.add(coor)
+        frontier.append(coor)
+  return layout
+
+
 class Puzzle:
 
-  def __init__(self, pieceSize, puzzleSize, pieces=[], scramble=True, nonSquare=False):
+  def __init__(self, pieceSize, puzzleSize, pieces=None, scramble=True, nonSquare=False, seed=None, lazy=False):
     """
     Creates puzzle
 
@@ -56,142 +118,162 @@ class Puzzle:
     pieces: list, ordered list of lists of pieces in corresponding position
     scramble: boolean, scramble the pieces after making
     nonSquare: boolean, whether any empty coordinates throughout puzzle
+    seed: integer, seeds the shape, the pieces and the scramble so the puzzle can be generated again byte for byte.
+      Every piece draws from its own stream (see substream), so pieces do not depend on the order they are made in
+    lazy: boolean, pieces keep only their borders and every empty coordinate shares one empty piece, so memory scales
+      with the perimeter of the pieces instead of their area (see JigsawPiece)
     """
     self.pieces = pieces
     self.pieceSize = pieceSize
     self.puzzleSize = puzzleSize
-    if len(self.pieces) == 0:
-      for vertical in range(self.puzzleSize):
-        puzzleCanvasLine = []
-        for horizontal in range(self.puzzleSize):
-          puzzleCanvasLine.append("-")
-        self.pieces.append(puzzleCanvasLine)
-
-      pieceByLocation = []  # a dictionary containing the locations of every placed piece
-      previouslyUsedCoordinates = []
-
-      vertical = random.randrange(0,len(self.pieces))
-      horizontal = random.randrange(0, len(self.pieces[0]))
-
-      pieceByLocation.append((horizontal, vertical))
-      while len(pieceByLocation) > len(previouslyUsedCoordinates):
-        coordinateCheck = False
-        while coordinateCheck == False:  # this loop ensures that randomly selected coordinate is not used more than once
-          coordinate = pieceByLocation[random.randrange(0, len(pieceByLocation))]
-          if coordinate not in previouslyUsedCoordinates:
-            previouslyUsedCoordinates.append(coordinate)
-            coordinateCheck = True
-        if nonSquare == True:
-          if len(pieceByLocation) == 1:
-            pass
-          else:
-            skipPiece = random.randrange(0, 3)
-            if skipPiece == 1:
-              continue
-        self.pieces[coordinate[1]][coordinate[0]] = 1
-        surCoor = surroundingCoordinates(coordinate[0],coordinate[1],self.puzzleSize-1)
-        for coor in surCoor:
-          if coor not in pieceByLocation:
-            pieceByLocation.append(coor)
+    if self.pieces is None or len(self.pieces) == 0:
+      self.pieces = generateLayout(puzzleSize=self.puzzleSize, nonSquare=nonSquare, rng=substream(seed, "layout"))
+      flatEdge = np.zeros(self.pieceSize, dtype=np.int8)
       for vertical in range(len(self.pieces)):
         for horizontal in range(len(self.pieces[0])):
           if self.pieces[vertical][horizontal] == 1:
-            top = {}
-            bottom = {}
-            left = {}
-            right = {}
+            top = None  # sides without constraints get random bumps
+            right = None
+            bottom = None
+            left = None
             if horizontal == 0 or self.pieces[vertical][horizontal - 1] == "-":
-              for mid in range(1, self.pieceSize - 1):
-                left[str(mid) + ",0"] = 0
+              left = flatEdge
             elif self.pieces[vertical][horizontal - 1] != "-":
-              left = self.pieces[vertical][horizontal - 1].rightConstraints
+              left = self.pieces[vertical][horizontal - 1].neighborConstraint(side=1)
             if horizontal == puzzleSize - 1 or self.pieces[vertical][horizontal + 1] == "-":
-              for mid in range(1, self.pieceSize - 1):
-                right[str(mid) + "," + str(self.pieceSize - 1)] = 0
+              right = flatEdge
             if vertical == 0 or self.pieces[vertical - 1][horizontal] == "-":
-              for mid in range(1, self.pieceSize - 1):
-                top["0," + str(mid)] = 0
+              top = flatEdge
             elif self.pieces[vertical - 1][horizontal] != "-":
-              top = self.pieces[vertical - 1][horizontal].bottomConstraints
+              top = self.pieces[vertical - 1][horizontal].neighborConstraint(side=2)
             if vertical == puzzleSize - 1 or self.pieces[vertical + 1][horizontal] == "-":
-              for mid in range(1, self.pieceSize - 1):
-                bottom[str(self.pieceSize - 1) + "," + str(mid)] = 0
-            allConstraints = combineConstraints(c1=top, c2=bottom, c3=left, c4=right)
-            self.pieces[vertical][horizontal] = JigsawPiece(size=self.pieceSize, buildingConstraints=allConstraints)
+              bottom = flatEdge
+            self.pieces[vertical][horizontal] = JigsawPiece(size=self.pieceSize, constraints=[top, right, bottom, left], lazy=lazy,
+                                                            rng=substream(seed, vertical, horizontal))
+      if lazy == True:
+        emptyPiece = JigsawPiece(size=self.pieceSize, empty=True, lazy=True)   # empty pieces never change, so one is shared
       for vertical in range(len(self.pieces)):
         for horizontal in range(len(self.pieces[0])):
           if self.pieces[vertical][horizontal] == "-":
-            self.pieces[vertical][horizontal] = JigsawPiece(size=self.pieceSize, empty=True)
+            if lazy == True:
+              self.pieces[vertical][horizontal] = emptyPiece
+            else:
+              self.pieces[vertical][horizontal] = JigsawPiece(size=self.pieceSize, empty=True)
     if scramble == True:
+      rng = substream(seed, "scramble")
       self.scrambledPieces = []
       for individual in self.pieces:
         for ip in individual:
           self.scrambledPieces.append(ip)
-      random.shuffle(self.scrambledPieces)
+      rng.shuffle(self.scrambledPieces)
+      self.scrambleRotations = []  # orientation of every scrambled piece, kept since solving rotates pieces in place
       for pp in self.scrambledPieces:
-        rotations = random.randrange(0, 4)
+        rotations = rng.randrange(0, 4)
         if pp.empty == False:
-          for r in range(rotations):
-            pp.rotatePiece()
+          pp.rotatePiece(rotations)
+          self.scrambleRotations.append(pp.orientation)
+        else:
+          self.scrambleRotations.append(0)
 
-  def displaySolved(self, path, type=""):
+  def renderArray(self, type="", crop=None, downscale=1):
     """
-    Saves entire puzzle as a png
+    Renders puzzle (or part of it) as an array of RGB pixels
 
     Parameters
-    path: string, path to output png
     type: string, 'answer' or not, changes which it uses orientation is used when placing pieces
+    crop: tuple, (left, top, right, bottom) in pieces, only these pieces are rendered (default is the whole puzzle)
+    downscale: integer, keeps every nth pixel along each axis of the whole puzzle for cheap previews
+
+    Return
+    array, height by width by 3 uint8 pixels
     """
-    outFile = path
-    out = Image.new("RGB", (self.pieceSize * self.puzzleSize, self.pieceSize * self.puzzleSize))
-    for line in range(len(self.pieces)):
-      for piece in range(len(self.pieces[line])):
+    if crop is None:
+      crop = (0, 0, len(self.pieces[0]), len(self.pieces))
+    left, top, right, bottom = crop
+    size = self.pieceSize
+    firstLine = -(-top * size // downscale) * downscale  # kept pixels line up with a downscaled render of the whole puzzle
+    firstPixel = -(-left * size // downscale) * downscale
+    lines = np.arange(firstLine, bottom * size, downscale) // size  # line of pieces every kept row falls in
+    pieces = np.arange(firstPixel, right * size, downscale) // size
+    rowStarts = np.searchsorted(lines, np.arange(top, bottom + 1)).tolist()  # first kept row of every line of pieces
+    columnStarts = np.searchsorted(pieces, np.arange(left, right + 1)).tolist()
+    pixels = np.empty((len(lines), len(pieces)), dtype=np.int8)
+    for line in range(top, bottom):
+      firstRow, lastRow = rowStarts[line - top], rowStarts[line - top + 1]
+      if firstRow == lastRow:   # downscaled past every row of this line
+        continue
+      rowOffset = firstLine + firstRow * downscale - line * size
+      for piece in range(left, right):
+        firstColumn, lastColumn = columnStarts[piece - left], columnStarts[piece - left + 1]
+        if firstColumn == lastColumn:
+          continue
         if type == "answer":
-          for pixelLine in range(len(self.pieces[line][piece].pieceInfo)):
-            for pixel in range(len(self.pieces[line][piece].pieceInfo[pixelLine])):
-              if self.pieces[line][piece].pieceInfo[pixelLine][pixel] == "-":
-                out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(0, 0, 0))
-              elif (line % 2 == 0 and piece % 2 == 0):
-                if self.pieces[line][piece].pieceInfo[pixelLine][pixel] == -1:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(191, 63, 65))
-                else:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(63, 116, 191))
-              elif (line % 2 == 1 and piece % 2 == 1):
-                if self.pieces[line][piece].pieceInfo[pixelLine][pixel] == -1:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(191, 63, 65))
-                else:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(63, 116, 191))
-              else:
-                if self.pieces[line][piece].pieceInfo[pixelLine][pixel] == -1:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(63, 116, 191))
-                else:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(191, 63, 65))
+          info = self.pieces[line][piece].pieceInfo
         else:
-          for pixelLine in range(len(self.pieces[line][piece].solvedOrientation)):
-            for pixel in range(len(self.pieces[line][piece].solvedOrientation[pixelLine])):
-              if self.pieces[line][piece].solvedOrientation[pixelLine][pixel] == "-":
-                out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)),(0, 0, 0))
-              elif (line % 2 == 0 and piece % 2 == 0):
-                if self.pieces[line][piece].solvedOrientation[pixelLine][pixel] == -1:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)), (191, 63, 65))
-                else:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)), (63, 116, 191))
-              elif (line % 2 == 1 and piece % 2 == 1):
-                if self.pieces[line][piece].solvedOrientation[pixelLine][pixel] == -1:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)), (191, 63, 65))
-                else:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)), (63, 116, 191))
-              else:
-                if self.pieces[line][piece].solvedOrientation[pixelLine][pixel] == -1:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)), (63, 116, 191))
-                else:
-                  out.putpixel(((piece * self.pieceSize + pixel), (line * self.pieceSize + pixelLine)), (191, 63, 65))
-    out.save(outFile)
+          info = self.pieces[line][piece].solvedOrientation
+        columnOffset = firstPixel + firstColumn * downscale - piece * size
+        pixels[firstRow:lastRow, firstColumn:lastColumn] = info[rowOffset::downscale, columnOffset::downscale]  # only kept pixels are copied
+    oddSquare = (lines[:, np.newaxis] + pieces[np.newaxis, :]) % 2 == 1  # checkerboard of pieces swaps the colours
+    red = (pixels == -1) != oddSquare
+    out = np.empty(pixels.shape + (3,), dtype=np.uint8)
+    out[...] = (63, 116, 191)
+    out[red] = (191, 63, 65)
+    out[pixels == emptyPixel] = (0, 0, 0)
+    return out
+
+  def displaySolved(self, path, type="", crop=None, downscale=1):
+    """
+    Saves entire puzzle as a png
+
+    Parameters
+    path: string, path to output png
+    type: string, 'answer' or not, changes which it uses orientation is used when placing pieces
+    crop: tuple, (left, top, right, bottom) in pieces, only these pieces are saved (default is the whole puzzle)
+    downscale: integer, keeps every nth pixel along each axis for cheap previews
+    """
+    out = Image.fromarray(self.renderArray(type=type, crop=crop, downscale=downscale), "RGB")
+    out.save(path)
+
+
+  def displayTiled(self, directory, tileSize=16, type="", downscale=1):
+    """
+    Saves puzzle as a directory of png tiles plus a manifest.json describing where each tile goes.
+    Tiles are rendered and saved one at a time so memory scales with the tile, not the whole puzzle
+
+    Parameters
+    directory: string, path to output directory, created if missing
+    tileSize: integer, number of pieces in length/width of each tile
+    type: string, 'answer' or not, changes which it uses orientation is used when placing pieces
+    downscale: integer, keeps every nth pixel along each axis for cheap previews
+
+    Return
+    dictionary, the manifest that was saved
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"pieceSize": self.pieceSize, "puzzleSize": self.puzzleSize, "tileSize": tileSize,
+                "downscale": downscale, "width": 0, "height": 0, "tiles": []}
+    y = 0
+    for top in range(0, len(self.pieces), tileSize):
+      bottom = min(top + tileSize, len(self.pieces))
+      x = 0
+      for left in range(0, len(self.pieces[0]), tileSize):
+        right = min(left + tileSize, len(self.pieces[0]))
+        tile = self.renderArray(type=type, crop=(left, top, right, bottom), downscale=downscale)
+        name = "tile_" + str(top // tileSize) + "_" + str(left // tileSize) + ".png"
+        Image.fromarray(tile, "RGB").save(os.path.join(directory, name))
+        manifest["tiles"].append({"path": name, "x": x, "y": y, "width": tile.shape[1], "height": tile.shape[0]})
+        x += tile.shape[1]
+      manifest["width"] = x
+      y += tile.shape[0]
+    manifest["height"] = y
+    with open(os.path.join(directory, "manifest.json"), "w") as manifestFile:
+      json.dump(manifest, manifestFile, indent=2)
+    return manifest
 
 
 class JigsawPiece:
 
-  def __init__(self, size, empty = False, buildingConstraints = {}):
+  def __init__(self, size, empty = False, constraints = None, lazy = False, rng = random):
     """
     Creates a square puzzle piece with jagged edges.
     Pixels along edges have three states (-1-concave, 0-flat, 1-protrudes).
@@ -200,96 +282,98 @@ class JigsawPiece:
     Parameters
     size: integer, number of pixels in length/width of piece
     empty: boolean, whether piece is empty or not
-    buildingConstraints: dictionary, any edge contraints from neighboring pieces
+    constraints: list, top, right, bottom and left edges required by neighboring pieces (see neighborConstraint), None for a random side
+    lazy: boolean, keep only the borders and build the pixels every time they are asked for instead of storing them
+    rng: random number generator the random sides draw from, the random module by default (see substream)
     """
     self.empty = empty
     self.pieceSize = size
-    self.pieceInfo = []
-    self.solvedOrientation = []
-    self.leftConstraints = {}
-    self.topConstraints = {}
-    self.rightConstraints = {}
-    self.bottomConstraints = {}
-    flatSide = [[],[],[],[]]
-    bumpList = [-1, 1]
+    self.orientation = 0  # number of clockwise rotations from solvedOrientation
+    self.lazy = lazy
+    self.pixels = None  # stored solvedOrientation, None until built
     if empty == True:
-      for info in range(size):
-        line = []
-        for element in range(size):
-          line.append("-")
-        self.pieceInfo.append(line)
+      self.borders = np.full((4, size), emptyPixel, dtype=np.int8)
     else:
-      for info in range(size):
-        line = []
-        for element in range(size):
-          constrain = buildingConstraints.get(str(info) + "," + str(element), 3)
-          if constrain == 3:
-            if element != 1 and info != 1 and element != size - 2 and info != size - 2:
-              if info == 0 or info == size - 1:
-                if element != 0 and element != size - 1 and element != 1 and element != size - 2:
-                  if element == size - 3:
-                    if info == 0:
-                      if 1 not in flatSide[0] and -1 not in flatSide[0]:
-                        number = bumpList[random.randrange(2)]
-                      else:
-                        number = random.randrange(-1, 2)
-                    else:
-                      if 1 not in flatSide[2] and -1 not in flatSide[2]:
-                        number = bumpList[random.randrange(2)]
-                      else:
-                        number = random.randrange(-1, 2)
-                  else:
-                    number = random.randrange(-1, 2)
-                  line.append(number)
-                  if info == 0:
-                    flatSide[0].append(number)
-                  else:
-                    flatSide[2].append(number)
-                  if info == 0:
-                    self.topConstraints[str(size - 1 - info) + "," + str(element)] = 0 - number
-                  else:
-                    self.bottomConstraints[str(size - 1 - info) + "," + str(element)] = 0 - number
-                else:
-                  line.append(0)
-              elif element == 0 or element == size - 1:
-                if info == size - 3:
-                  if element == 0:
-                    if 1 not in flatSide[3] and -1 not in flatSide[0]:
-                      number = bumpList[random.randrange(2)]
-                    else:
-                      number = random.randrange(-1, 2)
-                  else:
-                    if 1 not in flatSide[1] and -1 not in flatSide[2]:
-                      number = bumpList[random.randrange(2)]
-                    else:
-                      number = random.randrange(-1, 2)
-                else:
-                  number = random.randrange(-1, 2)
-                line.append(number)
-                if element == 0:
-                  flatSide[3].append(number)
-                else:
-                  flatSide[1].append(number)
-                if element == 0:
-                  self.leftConstraints[str(info) + "," + str(size - 1 - element)] = 0 - number
-                else:
-                  self.rightConstraints[str(info) + "," + str(size - 1 - element)] = 0 - number
-              else:
-                line.append(0)
-            else:
-              line.append(0)
-          else:
-            line.append(constrain)
-            if info == 0:
-              self.topConstraints[str(size - 1 - info) + "," + str(element)] = 0 - constrain
-            elif info == size - 1:
-              self.bottomConstraints[str(size - 1 - info) + "," + str(element)] = 0 - constrain
-            elif element == 0:
-              self.leftConstraints[str(info) + "," + str(size - 1 - element)] = 0 - constrain
-            else:
-              self.rightConstraints[str(info) + "," + str(size - 1 - element)] = 0 - constrain
-        self.pieceInfo.append(line)
-    self.solvedOrientation = self.pieceInfo
+      self.borders = np.zeros((4, size), dtype=np.int8)   # top, right, bottom and left edges of solvedOrientation, in the order of edges
+      if constraints is None:
+        constraints = [None, None, None, None]
+      for side in range(4):
+        if constraints[side] is not None:
+          self.borders[side] = constraints[side]
+        elif size > 4:   # the two pixels nearest each corner stay flat
+          bumps = rng.choices((-1, 0, 1), k=size - 4)
+          if not any(bumps):  # every unconstrained side gets at least one bump
+            bumps[-1] = rng.choice((-1, 1))
+          self.borders[side, 2:size - 2] = bumps
+    if lazy == False:
+      self.pixels = self.buildPixels()
+    self.cacheEdges()
+
+  def cacheEdges(self):
+    """
+    Reads the four edges of solvedOrientation once, keeping their clockwise signatures (see solver.py clockwiseEdge),
+    sums and hashes (see edgeHash). Rotating only changes which side holds which edge, so nothing is read again
+    """
+    if self.empty == True:
+      self.signatures = []
+      self.edgeSums = []
+      self.edgeHashes = []
+    else:
+      self.signatures = [tuple(self.borders[0].tolist()), tuple(self.borders[1].tolist()),
+                         tuple(self.borders[2][::-1].tolist()), tuple(self.borders[3][::-1].tolist())]
+      self.edgeSums = [sum(signature) for signature in self.signatures]
+      clockwise = self.borders.copy()
+      clockwise[2:] = clockwise[2:, ::-1]
+      self.edgeHashes = edgeHash(edges=clockwise).tolist()
+    self.determineEdgeIndex()
+
+  def buildPixels(self):
+    """
+    Builds the pixels of the piece in its solved orientation from its borders, interior pixels are always 0
+
+    Return
+    array, size by size pixels
+    """
+    size = self.pieceSize
+    if self.empty == True:
+      return np.full((size, size), emptyPixel, dtype=np.int8)
+    pixels = np.zeros((size, size), dtype=np.int8)
+    pixels[0, :] = self.borders[0]
+    pixels[:, size - 1] = self.borders[1]
+    pixels[size - 1, :] = self.borders[2]
+    pixels[:, 0] = self.borders[3]
+    return pixels
+
+  @property
+  def solvedOrientation(self):
+    """
+    Pixels of the piece before any rotation, built on every use by lazy pieces (empty ones keep theirs, they are shared)
+    """
+    if self.pixels is not None:
+      return self.pixels
+    if self.empty == True:
+      self.pixels = self.buildPixels()
+      return self.pixels
+    return self.buildPixels()
+
+  @property
+  def pieceInfo(self):
+    """
+    Pixels of the piece in its current orientation, a rotated view of solvedOrientation
+    """
+    return np.rot90(self.solvedOrientation, -self.orientation)
+
+  def neighborConstraint(self, side):
+    """
+    Calculates the edge a neighboring piece needs to connect to one side of this piece in its solved orientation
+
+    Parameters
+    side: integer, number between 0 and 3 inclusive corresponding to side (0-top, 1-right, 2-bottom, 3-left)
+
+    Return
+    array, negated values along side, in the order of the neighbor's connecting side
+    """
+    return -self.borders[side]
 
   def displayPiece(self, path):
     """
@@ -298,70 +382,60 @@ class JigsawPiece:
     Parameters
     path: string, path to output png
     """
-    outFile = path
-    out = Image.new("RGB", (self.pieceSize + 2, self.pieceSize + 2))
-    for pixelLine in range(self.pieceSize + 2):
-      for pixel in range(self.pieceSize + 2):
-        out.putpixel((pixel, pixelLine), (255, 255, 255))
-    for pixelLine in range(self.pieceSize):
-      for pixel in range(self.pieceSize):
-        if self.pieceInfo[pixelLine][pixel] == -1:
-          out.putpixel((pixel + 1, pixelLine + 1), (255, 255, 255))
-        elif self.pieceInfo[pixelLine][pixel] == 1:
-          if pixel == 0:
-            out.putpixel((pixel, pixelLine + 1), (63, 116, 191))
-          elif pixel == self.pieceSize - 1:
-            out.putpixel((pixel + 2, pixelLine + 1), (63, 116, 191))
-          elif pixelLine == 0:
-            out.putpixel((pixel + 1, pixelLine), (63, 116, 191))
-          elif pixelLine == self.pieceSize - 1:
-            out.putpixel((pixel + 1, pixelLine + 2), (63, 116, 191))
-          out.putpixel((pixel + 1, pixelLine + 1), (63, 116, 191))
-        else:
-          out.putpixel((pixel + 1, pixelLine + 1), (63, 116, 191))
-    out.save(outFile)
+    out = np.empty((self.pieceSize + 2, self.pieceSize + 2, 3), dtype=np.uint8)
+    out[...] = (255, 255, 255)
+    blue = (63, 116, 191)
+    info = self.pieceInfo
+    out[1:-1, 1:-1][info != -1] = blue   # concave pixels are cut out of the piece
+    out[1:-1, 0][info[:, 0] == 1] = blue   # protruding pixels stick out past the square
+    out[1:-1, -1][info[:, -1] == 1] = blue
+    out[0, 1:-1][info[0, :] == 1] = blue
+    out[-1, 1:-1][info[-1, :] == 1] = blue
+    Image.fromarray(out, "RGB").save(path)
 
   def determineEdgeIndex(self):
     """
-    Calculates edge indices by summing values along each edge, stored as list of integers
+    Sets edges and edge indices (sums of the values along each edge) for the current orientation by shifting the
+    cached edges (see cacheEdges). Pieces keep these up to date themselves, calling it again changes nothing.
+    Edges are views of the borders, so no pixels are built
     """
     self.edgeIndex = []
     self.edges = [[], [], [], []]
     if self.empty == True:
       pass
     else:
-      top = 0
-      bottom = 0
-      left = 0
-      right = 0
-      for row in range(len(self.pieceInfo)):
-        for column in range(len(self.pieceInfo[row])):
-          if row == 0:
-            top += self.pieceInfo[row][column]
-            self.edges[0].append(self.pieceInfo[row][column])
-          if row == self.pieceSize - 1:
-            bottom += self.pieceInfo[row][column]
-            self.edges[2].append(self.pieceInfo[row][column])
-          if column == 0:
-            left += self.pieceInfo[row][column]
-            self.edges[3].append(self.pieceInfo[row][column])
-          if column == self.pieceSize - 1:
-            right += self.pieceInfo[row][column]
-            self.edges[1].append(self.pieceInfo[row][column])
-      self.edgeIndex.append(top)
-      self.edgeIndex.append(right)
-      self.edgeIndex.append(bottom)
-      self.edgeIndex.append(left)
-
-  def rotatePiece(self):
+      self.edges = []
+      for side in range(4):
+        source = (side - self.orientation) % 4
+        if (source < 2) == (side < 2):
+          self.edges.append(self.borders[source])
+        else:
+          self.edges.append(self.borders[source][::-1])   # edges traversed against the clockwise order reverse when they move
+      for side in range(4):
+        self.edgeIndex.append(self.edgeSums[(side - self.orientation) % 4])
+
+  def rotatePiece(self, rotations=1):
     """
-    Rotates piece by 90 degrees clockwise, resets edge indices
+    Rotates piece by 90 degrees clockwise, shifting the cached edges to their new sides
+
+    Parameters
+    rotations: integer, number of clockwise rotations to apply at once
+    """
+    self.orientation = (self.orientation + rotations) % 4
+    self.determineEdgeIndex()
+
+  def rotatedEdge(self, side, rotations):
+    """
+    Reads the edge that would be on a side after rotating, without rotating the piece
+
+    Parameters
+    side: integer, number between 0 and 3 inclusive corresponding to side (0-top, 1-right, 2-bottom, 3-left)
+    rotations: integer, number of clockwise rotations
+
+    Return
+    array, values along edge in the same order as edges
     """
-    rotated = []
-    for row in range(self.pieceSize):
-      line = []
-      for column in range(self.pieceSize):
-        line.append(self.pieceInfo[self.pieceSize - 1 - column][row])
-      rotated.append(line)
-    self.pieceInfo = rotated
-    self.determineEdgeIndex()
\ No newline at end of file
+    source = (side - rotations) % 4
+    if (source < 2) == (side < 2):
+      return self.edges[source]
+    return self.edges[source][::-1]   # edges traversed against the clockwise order reverse when they move
@@ -1,25 +1,13 @@
+import argparse
+import heapq
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from creator import *
-import random
 
 
-def edgeCheck(edge0, edge1):
-  """
-  Checks whether piece edges are compatible
-
-  Parameters
-  edge0: list, values along one edge of piece 0
-  edge1: list, values along one edge of piece 1
-
-  Return
-  boolean, compatible or not
-  """
-  check = True
-  for element in range(len(edge0)):
-    if edge0[element] + edge1[element] != 0:
-      check = False
-      break
-  return check
-
 def coordinateFromRelativeDirection(coord, direction):
   """
   Determines coordinate of neighboring piece based on current piece and direction (up, down, left, right)
@@ -40,144 +28,1094 @@ def coordinateFromRelativeDirection(coord, direction):
   if direction == 3:
     return (coord[0] - 1, coord[1])
 
-def newSolvePuzzle(puzzle):
+def clockwiseEdge(piece, side, rotations=0):
+  """
+  Reads one edge of a piece in clockwise order (top left to right, right top to bottom, bottom right to left, left bottom to top).
+  In this order an edge keeps the same values no matter how the piece is rotated
+
+  Parameters
+  piece: piece, custom class (see creator.py JigsawPiece)
+  side: int, number between 0 and 3 inclusive corresponding to side (0-top, 1-right, 2-bottom, 3-left)
+  rotations: int, clockwise rotations not yet applied to the piece
+
+  Return
+  tuple, values along edge in clockwise order
+  """
+  return piece.signatures[(side - rotations - piece.orientation) % 4]   # read once when the piece was made
+
+def matchingSignature(signature):
+  """
+  Determines the clockwise edge that connects to a clockwise edge. Neighboring edges are traversed in opposite
+  directions and have opposite values, so the connecting edge is the negated and reversed signature
+
+  Parameters
+  signature: tuple, values along edge in clockwise order
+
+  Return
+  tuple, values along connecting edge in clockwise order
+  """
+  return tuple(-value for value in reversed(signature))
+
+def buildEdgeIndex(pieces):
+  """
+  Indexes every non-flat edge of the pieces by its clockwise signature
+
+  Parameters
+  pieces: list, pieces to index (see creator.py JigsawPiece)
+
+  Return
+  dictionary, clockwise signature to list of (piece, side) pairs
+  """
+  edgeIndex = {}
+  for piece in pieces:
+    if piece.empty == True:   # ignore empty pieces
+      continue
+    for side in range(4):
+      signature = clockwiseEdge(piece=piece, side=side)
+      if any(signature):  # flat sides do not have connections
+        edgeIndex.setdefault(signature, []).append((piece, side))
+  return edgeIndex
+
+class SolverStats:
+
+  def __init__(self, onPlacement=None, onFailure=None):
+    """
+    Collects timings and counts from a solve, pass one to newSolvePuzzle or searchSolvePuzzle.
+    Solvers only touch it when one is passed, so solving without it costs nothing extra
+
+    Parameters
+    onPlacement: function, called with (coordinate, piece, rotations) every time a piece is placed
+    onFailure: function, called with (coordinate, edge, candidates) where a solve gives up
+    """
+    self.onPlacement = onPlacement
+    self.onFailure = onFailure
+    self.times = {"index": 0.0, "candidates": 0.0, "rotations": 0.0}   # seconds spent in each phase
+    self.candidateCounts = []   # number of candidates found for every open edge, in the order they were matched
+    self.frontierSizes = []   # number of coordinates waiting in the frontier every time one is visited
+    self.placements = 0
+    self.backtracks = 0
+    self.failure = None
+
+  def addTime(self, phase, start):
+    """
+    Adds the time since start to a phase
+
+    Parameters
+    phase: string, 'index', 'candidates' or 'rotations'
+    start: float, time.perf_counter() when the phase started
+    """
+    self.times[phase] += time.perf_counter() - start
+
+  def placed(self, coordinate, piece, rotations):
+    """
+    Records a placement
+
+    Parameters
+    coordinate: tuple, (x, y) position of piece
+    piece: piece, custom class (see creator.py JigsawPiece)
+    rotations: integer, clockwise rotations the piece needs
+    """
+    self.placements += 1
+    if self.onPlacement is not None:
+      self.onPlacement(coordinate, piece, rotations)
+
+  def failed(self, coordinate, edge, candidates):
+    """
+    Records where a solve gave up
+
+    Parameters
+    coordinate: tuple, (x, y) position being matched, None if the solve ran out of coordinates or budget
+    edge: integer, side being matched, None if not matching a side
+    candidates: list, pieces that could have gone there
+    """
+    self.failure = {"coordinate": coordinate, "edge": edge, "candidates": len(candidates)}
+    if self.onFailure is not None:
+      self.onFailure(coordinate, edge, candidates)
+
+  def summary(self):
+    """
+    Summarizes the solve
+
+    Return
+    dictionary, times, placements, backtracks, candidate and frontier statistics and the failure point
+    """
+    counts = self.candidateCounts
+    return {"times": dict(self.times), "placements": self.placements, "backtracks": self.backtracks,
+            "edgesMatched": len(counts), "uniqueEdges": counts.count(1),
+            "maxCandidates": max(counts) if len(counts) > 0 else 0,
+            "maxFrontier": max(self.frontierSizes) if len(self.frontierSizes) > 0 else 0,
+            "failure": self.failure}
+
+class EdgeTable:
+
+  def __init__(self, pieces):
+    """
+    Finds exact matches for many edges at once in a stacked table of the clockwise edges of every piece, in the side
+    order of solvedOrientation. Edges are sorted by the hashes pieces cached when they were made (see creator.py
+    JigsawPiece.cacheEdges), so every lookup is a binary search and only edges sharing the hash are compared value by value
+
+    Parameters
+    pieces: list, pieces to match against (see creator.py JigsawPiece), empty ones are left out
+    """
+    self.pieces = [piece for piece in pieces if piece.empty == False]
+    self.table = np.array([piece.borders for piece in self.pieces], dtype=np.int8)
+    self.table[:, 2:] = self.table[:, 2:, ::-1]   # bottom and left run right to left and bottom to top clockwise
+    hashes = np.array([piece.edgeHashes for piece in self.pieces], dtype=np.uint64).reshape(-1)
+    self.order = np.argsort(hashes, kind="stable")  # stable, so equal hashes stay in piece then side order
+    self.sortedHashes = hashes[self.order]
+
+  def match(self, signatures):
+    """
+    Finds every piece side with each signature in one pass: a binary search finds the run of edges sharing the hash of
+    every signature, then every run is gathered and compared value by value at once
+
+    Parameters
+    signatures: array, clockwise signatures to look up, one per row
+
+    Return
+    array, row of the signature of every match
+    array, piece number (position in pieces) of every match
+    array, side of solvedOrientation of every match
+    matches of a signature are listed by piece number, then side
+    """
+    size = self.table.shape[-1]
+    signatures = np.asarray(signatures, dtype=np.int8).reshape(-1, size)
+    hashes = edgeHash(edges=signatures)
+    lows = np.searchsorted(self.sortedHashes, hashes, side="left")
+    counts = np.searchsorted(self.sortedHashes, hashes, side="right") - lows
+    counts[~signatures.any(axis=1)] = 0   # flat sides do not have connections
+    rows = np.repeat(np.arange(len(signatures)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)   # position of every candidate within its run
+    positions = self.order[np.repeat(lows, counts) + offsets]
+    exact = np.all(self.table.reshape(-1, size)[positions] == signatures[rows], axis=1)
+    positions = positions[exact]
+    return rows[exact], positions // 4, positions % 4
+
+def newSolvePuzzle(puzzle, stats=None, batch=False):
   """
   Solves a scrambled puzzle that has pieces with all unique edges
 
   Parameters
   puzzle: puzzle, custom class (see creator.py Puzzle)
+  stats: SolverStats, collects timings, counts and callbacks (default is no instrumentation)
+  batch: boolean, matches the open edges of every frontier level at once (see frontierSolve)
+
+  Return
+  dictionary, all pieces with unscrambled coordinates
+  """
+  return frontierSolve(pieces=puzzle.scrambledPieces, stats=stats, batch=batch)
+
+def levelMatches(table, numbers, coordinates, pieceByLocation, previouslyUsedPieces):
+  """
+  Looks up every edge of a frontier level that faces an open coordinate in one EdgeTable.match call
+
+  Parameters
+  table: EdgeTable, edges of every piece being solved
+  numbers: dictionary, piece to its position in the pieces of the table
+  coordinates: list, placed coordinates of the level
+  pieceByLocation: dictionary, placed pieces by coordinate
+  previouslyUsedPieces: dictionary, placed pieces with the rotations they still need
+
+  Return
+  dictionary, (coordinate, edge) to list of (piece, side) pairs, in the same order as buildEdgeIndex lists them.
+    Flat edges are left out
+  """
+  keys = []
+  pieceNumbers = []
+  solvedSides = []
+  for coordinate in coordinates:
+    piece = pieceByLocation[coordinate]
+    turns = (piece.orientation + previouslyUsedPieces[piece]) % 4  # clockwise turns from solvedOrientation once placed
+    for edge in range(4):
+      if coordinateFromRelativeDirection(coord=coordinate, direction=edge) not in pieceByLocation:
+        keys.append((coordinate, edge))
+        pieceNumbers.append(numbers[piece])
+        solvedSides.append((edge - turns) % 4)
+  if len(keys) == 0:
+    return {}
+  signatures = -table.table[pieceNumbers, solvedSides, ::-1]  # matching signature of every edge (see matchingSignature)
+  rows, matchNumbers, matchSides = table.match(signatures=signatures)
+  matches = {keys[row]: [] for row in np.flatnonzero(signatures.any(axis=1)).tolist()}
+  for row, number, side in zip(rows.tolist(), matchNumbers.tolist(), matchSides.tolist()):
+    piece = table.pieces[number]
+    matches[keys[row]].append((piece, (side + piece.orientation) % 4))
+  return matches
+
+def frontierSolve(pieces, stats=None, bounds=None, batch=False):
+  """
+  Places pieces outward from a starting piece, visiting placed coordinates in the order they were placed (see newSolvePuzzle)
+
+  Parameters
+  pieces: list, scrambled pieces to solve, empty ones are skipped (see creator.py JigsawPiece)
+  stats: SolverStats, collects timings, counts and callbacks (default is no instrumentation)
+  bounds: list, filled with (xMin, yMin, xMax, yMax) of the placed pieces when given, tracked as pieces are placed
+  batch: boolean, candidates of every open edge of a frontier level are found in one vectorized lookup (see EdgeTable)
+    before its placements are made one by one in frontier order, so pieces are placed exactly as without it
 
   Return
   dictionary, all pieces with unscrambled coordinates
   """
-  flatSide = []   # creates an example of a flat side for comparison, flat sides do not have connections
-  for number in range(puzzle.pieceSize):  # loop based on piece size
-    flatSide.append(0)
   pieceByLocation = {}  # a dictionary containing the locations of every placed piece
   startingPieceNotEmpty = False
   increment = 0
   while startingPieceNotEmpty == False:
-    if puzzle.scrambledPieces[increment].empty == False:
+    if pieces[increment].empty == False:
       startingPieceNotEmpty = True
-      pieceByLocation[(0,0)] = puzzle.scrambledPieces[increment]
+      pieceByLocation[(0,0)] = pieces[increment]
     else:
       increment += 1
-  previouslyUsedPieces = []   # a list of all previously placed pieces
-  previouslyUsedPieces.append(puzzle.scrambledPieces[0])
-  previouslyUsedCoordinates = []  # a list of all previously used coordinates, don't want to place two pieces on same coordinate
-  numberOfEmpties = 0
-  for emptyCheck in puzzle.scrambledPieces:
-    if emptyCheck.empty == True:
-      numberOfEmpties += 1
-  nonUniqueCoordinates = []
-  unplacedCoors = 0
-  while len(pieceByLocation) < (puzzle.puzzleSize**2)-numberOfEmpties-unplacedCoors:
-    coordinateCheck = False
-    while coordinateCheck == False: # this loop ensures that randomly selected coordinate is not used more than once
-      coordinateList = list(pieceByLocation.keys())
-      coordinate = coordinateList[random.randrange(0,len(coordinateList))]
-      if coordinate not in previouslyUsedCoordinates:
-        previouslyUsedCoordinates.append(coordinate)
-        coordinateCheck = True
+  previouslyUsedPieces = {}   # all previously placed pieces, with the rotations they still need
+  previouslyUsedPieces[pieces[increment]] = 0
+  if stats is not None:
+    start = time.perf_counter()
+  if batch == True:
+    table = EdgeTable(pieces=pieces)
+    numbers = {piece: number for number, piece in enumerate(table.pieces)}
+    levelRemaining = 0  # coordinates of the current frontier level still to visit
+  else:
+    edgeIndex = buildEdgeIndex(pieces=pieces)   # built once, every lookup afterwards is constant time
+  if stats is not None:
+    stats.addTime("index", start)
+  numberOfPieces = 0
+  for emptyCheck in pieces:
+    if emptyCheck.empty == False:
+      numberOfPieces += 1
+  xMin, yMin, xMax, yMax = 0, 0, 0, 0
+  frontier = deque([(0, 0)])  # placed coordinates in the order they were placed, each is visited once
+  while len(pieceByLocation) < numberOfPieces:
+    if len(frontier) == 0:  # the remaining pieces never connect to the placed ones
+      if stats is not None:
+        stats.failed(None, None, [])
+      return {}, False
+    if stats is not None:
+      stats.frontierSizes.append(len(frontier))
+    if batch == True and levelRemaining == 0:   # every coordinate in the frontier was placed before this level started
+      if stats is not None:
+        start = time.perf_counter()
+      matches = levelMatches(table=table, numbers=numbers, coordinates=list(frontier), pieceByLocation=pieceByLocation,
+                             previouslyUsedPieces=previouslyUsedPieces)
+      levelRemaining = len(frontier)
+      if stats is not None:
+        stats.addTime("candidates", start)
+    coordinate = frontier.popleft()
+    if batch == True:
+      levelRemaining -= 1
     piece = pieceByLocation[coordinate] # pulls piece from dictionary based on location
+    pieceRotations = previouslyUsedPieces[piece]
     for edge in range(len(piece.edgeIndex)):  # tries to match every edge of the piece
       newPieceCoordinate = coordinateFromRelativeDirection(coord=coordinate, direction=edge)
-      if piece.edges[edge] == flatSide:
+      if batch == True and (coordinate, edge) not in matches:   # flat, or facing a piece placed before the level
+        pass
+      elif batch == False and not piece.rotatedEdge(side=edge, rotations=pieceRotations).any():  # flat sides do not have connections
         pass
-      elif newPieceCoordinate in list(pieceByLocation.keys()):
+      elif newPieceCoordinate in pieceByLocation:
         pass
       else:
+        if stats is not None:
+          start = time.perf_counter()
         possibleConnectionsForEdge = []
-        for testPiece in puzzle.scrambledPieces:
-          if piece == testPiece:  # cannot connect piece to itself, no reason to check
-            pass
-          elif testPiece.empty == True:   # ignore empty pieces
+        connectingSides = {}
+        if batch == True:
+          edgeMatches = matches[(coordinate, edge)]   # pieces placed since the lookup are skipped below
+        else:
+          signature = matchingSignature(signature=clockwiseEdge(piece=piece, side=edge, rotations=pieceRotations))
+          edgeMatches = edgeIndex.get(signature, [])
+        for testPiece, e in edgeMatches:
+          if testPiece in previouslyUsedPieces:
             pass
-          else:
-            for e in range(len(testPiece.edgeIndex)):
-              if testPiece in previouslyUsedPieces:
-                pass
-              elif piece.edgeIndex[edge] == -testPiece.edgeIndex[e]:  # checks edge index before rotating
-                desiredEdge = (edge + 2) % 4  # uses index of edge in list to determine how to rotate
-                rotations = desiredEdge - e
-                if rotations < 0:
-                  rotations = 4 + rotations
-                returnRotations = 4 - rotations
-                for rotate in range(rotations):
-                  testPiece.rotatePiece()
-                check = edgeCheck(edge0=piece.edges[edge], edge1=testPiece.edges[desiredEdge])
-                if check == True:   # if it passes the edge check, add to possible connections
-                  possibleConnectionsForEdge.append(testPiece)
-                  break
-                else:
-                  for rotate in range(returnRotations): # rotates back to original position after fail
-                    testPiece.rotatePiece()
+          elif testPiece not in connectingSides:  # first matching side of each piece is used
+            possibleConnectionsForEdge.append(testPiece)
+            connectingSides[testPiece] = e
+        if stats is not None:
+          stats.addTime("candidates", start)
+          stats.candidateCounts.append(len(possibleConnectionsForEdge))
         if len(possibleConnectionsForEdge) == 1:  # setting up for possibility of non-unique edges in future
-          pieceByLocation[newPieceCoordinate] = possibleConnectionsForEdge[0]
-          previouslyUsedPieces.append(possibleConnectionsForEdge[0])
+          testPiece = possibleConnectionsForEdge[0]
+          desiredEdge = (edge + 2) % 4  # uses index of edge in list to determine how to rotate
+          pieceByLocation[newPieceCoordinate] = testPiece
+          previouslyUsedPieces[testPiece] = (desiredEdge - connectingSides[testPiece]) % 4
+          frontier.append(newPieceCoordinate)
+          xMin, xMax = min(xMin, newPieceCoordinate[0]), max(xMax, newPieceCoordinate[0])
+          yMin, yMax = min(yMin, newPieceCoordinate[1]), max(yMax, newPieceCoordinate[1])
+          if stats is not None:
+            stats.placed(newPieceCoordinate, testPiece, previouslyUsedPieces[testPiece])
         else:
+          if stats is not None:
+            stats.failed(newPieceCoordinate, edge, possibleConnectionsForEdge)
           return {}, False
-      unplacedCoors = 0
-      for nUCoor in nonUniqueCoordinates:
-        if nUCoor not in pieceByLocation:
-          unplacedCoors += 1
+  if stats is not None:
+    start = time.perf_counter()
+  for piece in pieceByLocation.values():  # rotations are only applied once the puzzle is solved
+    if previouslyUsedPieces[piece] != 0:
+      piece.rotatePiece(previouslyUsedPieces[piece])
+  if stats is not None:
+    stats.addTime("rotations", start)
+  if bounds is not None:
+    bounds[:] = [xMin, yMin, xMax, yMax]
   return pieceByLocation, True
 
-def placeOnCanvas(pieces):
+def pieceComponents(pieces):
+  """
+  Groups pieces that connect through any chain of matching edges. Pieces in different groups can never touch,
+  so every group can be solved on its own
+
+  Parameters
+  pieces: list, pieces to group (see creator.py JigsawPiece)
+
+  Return
+  list, lists of pieces in every group, in the order their first piece appears
+  """
+  pieces = [piece for piece in pieces if piece.empty == False]
+  if len(pieces) == 0:
+    return []
+  table = EdgeTable(pieces=pieces)
+  parent = list(range(len(pieces)))   # union-find forest over piece numbers
+  def root(position):
+    while parent[position] != position:
+      parent[position] = parent[parent[position]]
+      position = parent[position]
+    return position
+  edges = table.table.reshape(-1, pieces[0].pieceSize)
+  rows, pieceNumbers, sides = table.match(signatures=-edges[:, ::-1])   # every edge looks up the signature that connects to it
+  for position, other in zip((rows // 4).tolist(), pieceNumbers.tolist()):
+    parent[root(position)] = root(other)
+  groups = {}
+  for position, piece in enumerate(pieces):
+    groups.setdefault(root(position), []).append(piece)
+  return list(groups.values())
+
+def solveComponent(pieces, stats=None):
+  """
+  Solves one group of pieces (see pieceComponents), runs in a worker process when solving in parallel
+
+  Parameters
+  pieces: list, pieces of the group (see creator.py JigsawPiece)
+  stats: SolverStats, collects timings, counts and callbacks (default is no instrumentation)
+
+  Return
+  list, (x, y, orientation) of every piece in the order given
+  list, (xMin, yMin, xMax, yMax) of the coordinates
+  boolean, solved or not
+  """
+  bounds = []
+  pieceByLocation, success = frontierSolve(pieces=pieces, stats=stats, bounds=bounds)
+  if success == False:
+    return [], [], False
+  location = {piece: coordinate for coordinate, piece in pieceByLocation.items()}
+  return [location[piece] + (piece.orientation,) for piece in pieces], bounds, True
+
+def clusterSolvePuzzle(puzzle, workers=None, stats=None):
+  """
+  Solves a scrambled puzzle whose pieces may form several separate clusters. Pieces are grouped by the edges they
+  could connect through (see pieceComponents) and every group is solved on its own, across processes when workers given
+
+  Parameters
+  puzzle: puzzle, custom class (see creator.py Puzzle)
+  workers: integer, number of processes solving groups in parallel (default solves them in this process)
+  stats: SolverStats, collects timings, counts and callbacks across every group, only when solving in this process
+
+  Return
+  list, (pieceByLocation, bounds) of every solved cluster, largest first (see placeClusters)
+  boolean, every cluster solved or not
+  """
+  if stats is not None and workers is not None and workers > 1:
+    raise ValueError("SolverStats can only collect from clusters solved in this process, leave workers unset")
+  components = pieceComponents(pieces=puzzle.scrambledPieces)
+  if workers is None or workers < 2 or len(components) < 2:
+    results = [solveComponent(pieces=pieces, stats=stats) for pieces in components]
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      results = list(pool.map(solveComponent, components))
+  clusters = []
+  success = True
+  for pieces, (placements, bounds, solved) in zip(components, results):
+    if solved == False:
+      success = False
+      continue
+    pieceByLocation = {}
+    for piece, (x, y, orientation) in zip(pieces, placements):
+      if piece.orientation != orientation:  # pieces solved in another process were rotated there, not here
+        piece.rotatePiece((orientation - piece.orientation) % 4)
+      pieceByLocation[(x, y)] = piece
+    clusters.append((pieceByLocation, tuple(bounds)))
+  clusters.sort(key=lambda cluster: len(cluster[0]), reverse=True)
+  return clusters, success
+
+class PuzzleSearch:
+
+  def __init__(self, puzzle, maxNodes=1000000, timeLimit=None, stats=None):
+    """
+    Depth first search over piece placements for puzzles whose edges are not all unique.
+    The open coordinate with the fewest candidates is always filled next, so unique edges never branch
+
+    Parameters
+    puzzle: puzzle, custom class (see creator.py Puzzle)
+    maxNodes: integer, most placements to try before giving up
+    timeLimit: float, most seconds to search before giving up (default is no limit)
+    stats: SolverStats, collects timings, counts and callbacks (default is no instrumentation)
+    """
+    self.puzzle = puzzle
+    self.maxNodes = maxNodes
+    self.timeLimit = timeLimit
+    self.stats = stats
+    self.nodes = 0
+    if stats is not None:
+      start = time.perf_counter()
+    self.edgeIndex = buildEdgeIndex(pieces=puzzle.scrambledPieces)
+    if stats is not None:
+      stats.addTime("index", start)
+    self.pieceByLocation = {}   # placed pieces by coordinate
+    self.rotations = {}   # rotations each placed piece still needs
+    self.domains = {}   # candidate (piece, rotations) pairs of every open coordinate
+    self.versions = {}  # newest heap entry of every open coordinate, older entries are skipped
+    self.heap = []
+    self.counter = 0
+    self.trail = []   # every change since the search started, undone when backtracking
+    self.bounds = (0, 0, 0, 0)  # smallest and largest x and y of placed pieces
+
+  def pushCell(self, cell):
+    """
+    Adds an open coordinate to the heap under its current number of candidates
+
+    Parameters
+    cell: tuple, (x, y) position of open coordinate
+    """
+    self.counter += 1
+    self.versions[cell] = self.counter
+    heapq.heappush(self.heap, (len(self.domains[cell]), self.counter, cell))
+
+  def requiredEdges(self, cell):
+    """
+    Determines the edges a piece needs to fit next to every placed neighbor
+
+    Parameters
+    cell: tuple, (x, y) position of coordinate
+
+    Return
+    list, (direction, clockwise signature) pairs
+    """
+    required = []
+    for direction in range(4):
+      neighbor = self.pieceByLocation.get(coordinateFromRelativeDirection(coord=cell, direction=direction))
+      if neighbor is not None:
+        edge = clockwiseEdge(piece=neighbor, side=(direction + 2) % 4, rotations=self.rotations[neighbor])
+        required.append((direction, matchingSignature(signature=edge)))
+    return required
+
+  def cellCandidates(self, cell, required):
+    """
+    Finds every unused piece and rotation that fits next to every placed neighbor
+
+    Parameters
+    cell: tuple, (x, y) position of coordinate
+    required: list, (direction, clockwise signature) pairs with at least one non-flat signature
+
+    Return
+    list, (piece, rotations) pairs
+    """
+    if self.stats is not None:
+      start = time.perf_counter()
+    for direction, signature in required:   # looks up the first connecting edge, checks the rest
+      if any(signature):
+        break
+    candidates = []
+    for piece, side in self.edgeIndex.get(signature, []):
+      if piece in self.rotations:
+        continue
+      rotations = (direction - side) % 4
+      fits = True
+      for otherDirection, otherSignature in required:
+        if clockwiseEdge(piece=piece, side=otherDirection, rotations=rotations) != otherSignature:
+          fits = False
+          break
+      if fits == True:
+        candidates.append((piece, rotations))
+    if self.stats is not None:
+      self.stats.addTime("candidates", start)
+      self.stats.candidateCounts.append(len(candidates))
+    return candidates
+
+  def place(self, cell, piece, rotations):
+    """
+    Places a piece and shrinks the candidates of every coordinate next to it
+
+    Parameters
+    cell: tuple, (x, y) position of coordinate
+    piece: piece, custom class (see creator.py JigsawPiece)
+    rotations: integer, clockwise rotations the piece needs
+    """
+    self.nodes += 1
+    self.pieceByLocation[cell] = piece
+    self.rotations[piece] = rotations
+    if self.stats is not None:
+      self.stats.placed(cell, piece, rotations)
+    self.trail.append(("place", cell, piece, self.bounds))
+    self.bounds = (min(self.bounds[0], cell[0]), max(self.bounds[1], cell[0]), min(self.bounds[2], cell[1]), max(self.bounds[3], cell[1]))
+    for direction in range(4):
+      neighbor = coordinateFromRelativeDirection(coord=cell, direction=direction)
+      if neighbor in self.pieceByLocation:
+        continue
+      edge = clockwiseEdge(piece=piece, side=direction, rotations=rotations)
+      if neighbor in self.domains:
+        signature = matchingSignature(signature=edge)
+        side = (direction + 2) % 4
+        shrunk = []
+        for candidate, candidateRotations in self.domains[neighbor]:
+          if candidate not in self.rotations and clockwiseEdge(piece=candidate, side=side, rotations=candidateRotations) == signature:
+            shrunk.append((candidate, candidateRotations))
+        self.trail.append(("domain", neighbor, self.domains[neighbor]))
+        self.domains[neighbor] = shrunk
+        self.pushCell(cell=neighbor)
+      elif any(edge):   # flat sides do not open a coordinate
+        if self.inBounds(cell=neighbor):
+          self.domains[neighbor] = self.cellCandidates(cell=neighbor, required=self.requiredEdges(cell=neighbor))
+        else:
+          self.domains[neighbor] = []
+        self.trail.append(("open", neighbor))
+        self.pushCell(cell=neighbor)
+
+  def inBounds(self, cell):
+    """
+    Checks whether a piece on a coordinate keeps the placed pieces within the size of the puzzle
+
+    Parameters
+    cell: tuple, (x, y) position of coordinate
+
+    Return
+    boolean, within size or not
+    """
+    size = self.puzzle.puzzleSize
+    return self.bounds[1] - size < cell[0] < self.bounds[0] + size and self.bounds[3] - size < cell[1] < self.bounds[2] + size
+
+  def undo(self, mark):
+    """
+    Reverses changes until the trail is back to a previous length
+
+    Parameters
+    mark: integer, length of trail to go back to
+    """
+    while len(self.trail) > mark:
+      change = self.trail.pop()
+      if change[0] == "place":
+        del self.pieceByLocation[change[1]]
+        del self.rotations[change[2]]
+        self.bounds = change[3]
+      elif change[0] == "open":
+        del self.domains[change[1]]
+      else:   # "domain" and "select" both restore candidates
+        self.domains[change[1]] = change[2]
+        self.pushCell(cell=change[1])
+
+  def selectCell(self):
+    """
+    Removes the open coordinate with the fewest candidates
+
+    Return
+    tuple, (cell, candidates) or None if no coordinate is open
+    """
+    while len(self.heap) > 0:
+      size, version, cell = heapq.heappop(self.heap)
+      if self.versions.get(cell) != version or cell not in self.domains:
+        continue
+      candidates = []
+      for candidate in self.domains[cell]:  # pieces placed elsewhere since the entry was pushed
+        if candidate[0] not in self.rotations:
+          candidates.append(candidate)
+      if len(candidates) != size:
+        self.trail.append(("domain", cell, self.domains[cell]))
+        self.domains[cell] = candidates
+        self.pushCell(cell=cell)
+        continue
+      self.trail.append(("select", cell, self.domains[cell]))
+      del self.domains[cell]
+      if not self.inBounds(cell=cell):
+        return cell, []
+      return cell, candidates
+    return None
+
+  def overBudget(self, start):
+    """
+    Checks whether the search has used up its nodes or time
+
+    Parameters
+    start: float, time the search started
+
+    Return
+    boolean, out of budget or not
+    """
+    if self.nodes > self.maxNodes:
+      return True
+    if self.timeLimit is not None and self.nodes % 256 == 0:
+      return time.perf_counter() - start > self.timeLimit
+    return False
+
+  def solve(self):
+    """
+    Searches until every piece is placed with no coordinate left open, the search is exhausted or the budget runs out
+
+    Return
+    dictionary, all pieces with unscrambled coordinates
+    boolean, solved or not
+    """
+    start = time.perf_counter()
+    pieces = [piece for piece in self.puzzle.scrambledPieces if piece.empty == False]
+    self.place(cell=(0, 0), piece=pieces[0], rotations=0)
+    stack = []  # (cell, candidates, index of candidate placed, trail length before placing) of every choice
+    while len(self.pieceByLocation) < len(pieces) or len(self.domains) > 0:  # bumps facing no piece leave coordinates open
+      if self.overBudget(start=start):
+        if self.stats is not None:
+          self.stats.failed(None, None, [])
+        return {}, False
+      if self.stats is not None:
+        self.stats.frontierSizes.append(len(self.domains))
+      selected = self.selectCell()
+      if selected is not None and len(selected[1]) > 0:
+        stack.append([selected[0], selected[1], 0, len(self.trail)])
+        self.place(cell=selected[0], piece=selected[1][0][0], rotations=selected[1][0][1])
+        continue
+      if self.stats is not None:
+        self.stats.backtracks += 1
+      while len(stack) > 0:   # dead end, moves on to the next candidate of the most recent choice
+        choice = stack[-1]
+        self.undo(mark=choice[3])
+        choice[2] += 1
+        if choice[2] < len(choice[1]):
+          self.place(cell=choice[0], piece=choice[1][choice[2]][0], rotations=choice[1][choice[2]][1])
+          break
+        stack.pop()
+      else:
+        if self.stats is not None:
+          self.stats.failed(None if selected is None else selected[0], None, [])
+        return {}, False
+    if self.stats is not None:
+      start = time.perf_counter()
+    for piece in self.pieceByLocation.values():  # rotations are only applied once the puzzle is solved
+      if self.rotations[piece] != 0:
+        piece.rotatePiece(self.rotations[piece])
+    if self.stats is not None:
+      self.stats.addTime("rotations", start)
+    return dict(self.pieceByLocation), True
+
+def searchSolvePuzzle(puzzle, maxNodes=1000000, timeLimit=None, stats=None):
+  """
+  Solves a scrambled puzzle that may have pieces with non-unique edges by backtracking (see PuzzleSearch)
+
+  Parameters
+  puzzle: puzzle, custom class (see creator.py Puzzle)
+  maxNodes: integer, most placements to try before giving up
+  timeLimit: float, most seconds to search before giving up (default is no limit)
+  stats: SolverStats, collects timings, counts and callbacks (default is no instrumentation)
+
+  Return
+  dictionary, all pieces with unscrambled coordinates
+  """
+  return PuzzleSearch(puzzle=puzzle, maxNodes=maxNodes, timeLimit=timeLimit, stats=stats).solve()
+
+class IncrementalSolver:
+
+  def __init__(self):
+    """
+    Assembles pieces as they arrive instead of from a whole scrambled puzzle.
+    Edges are grouped by signature with the edges that connect to them. Two edges are linked, merging their clusters,
+    only when they are the last two open edges of their group, where edges next to each other in a cluster without a link
+    are already filled. A piece arriving later can make a group ambiguous again, which breaks its link and splits the
+    cluster, so the assembly is always the one the pieces so far force. Only the groups of an arriving piece (and groups a
+    change touches) are looked at, pieces already added are never scanned again
+    """
+    self.edgeIndex = {}   # clockwise signature to (piece, side) of every edge with it
+    self.links = {}   # (piece, side) to the (piece, side) it is linked with, both ways
+    self.location = {}  # piece to [cluster number, (x, y), orientation it is placed in]
+    self.clusterPieces = {}   # cluster number to pieces by coordinate
+    self.clusterCount = 0
+    self.pending = set()  # groups whose forced link does not fit yet, tried again whenever a link breaks
+
+  def solvedEdge(self, piece, side):
+    """
+    Reads an edge of a piece in its solved orientation, however the piece is rotated now
+
+    Parameters
+    piece: piece, custom class (see creator.py JigsawPiece)
+    side: integer, number between 0 and 3 inclusive corresponding to side of solvedOrientation
+
+    Return
+    tuple, values along edge in clockwise order
+    """
+    return clockwiseEdge(piece=piece, side=side, rotations=-piece.orientation)
+
+  def facingCell(self, piece, side):
+    """
+    Determines the coordinate a side of a placed piece faces
+
+    Parameters
+    piece: piece, custom class (see creator.py JigsawPiece)
+    side: integer, side of solvedOrientation
+
+    Return
+    tuple, (x, y) position in the piece's cluster
+    """
+    cluster, cell, orientation = self.location[piece]
+    return coordinateFromRelativeDirection(coord=cell, direction=(side + orientation) % 4)
+
+  def group(self, piece, side):
+    """
+    Names the group of an edge, the smaller of its signature and the signature that connects to it
+
+    Parameters
+    piece: piece, custom class (see creator.py JigsawPiece)
+    side: integer, side of solvedOrientation
+
+    Return
+    tuple, signature naming the group
+    """
+    signature = self.solvedEdge(piece=piece, side=side)
+    return min(signature, matchingSignature(signature=signature))
+
+  def isOpen(self, edge):
+    """
+    Checks whether an edge could still take a link, it is open unless it faces a piece of its cluster it is not linked with
+
+    Parameters
+    edge: tuple, (piece, side of solvedOrientation)
+
+    Return
+    boolean, open or not
+    """
+    return edge in self.links or self.facingCell(piece=edge[0], side=edge[1]) not in self.clusterPieces[self.location[edge[0]][0]]
+
+  def addPiece(self, piece):
+    """
+    Adds an arriving piece, linking and merging whatever its edges force and breaking links it makes ambiguous
+
+    Parameters
+    piece: piece, custom class (see creator.py JigsawPiece)
+
+    Return
+    integer, number of the cluster the piece ended up in (None for empty pieces)
+    """
+    if piece.empty == True:
+      return None
+    self.clusterCount += 1
+    self.clusterPieces[self.clusterCount] = {(0, 0): piece}
+    self.location[piece] = [self.clusterCount, (0, 0), piece.orientation]
+    groups = []
+    for side in range(4):
+      signature = self.solvedEdge(piece=piece, side=side)
+      if any(signature):  # flat sides do not have connections
+        self.edgeIndex.setdefault(signature, []).append((piece, side))
+        groups.append(self.group(piece=piece, side=side))
+    self.settle(groups=groups)
+    return self.location[piece][0]
+
+  def settle(self, groups):
+    """
+    Checks groups until nothing changes, linking the pair a group forces and breaking links it no longer forces
+
+    Parameters
+    groups: list, groups to check (see group)
+    """
+    work = deque(groups)
+    while len(work) > 0:
+      name = work.popleft()
+      signatures = [name, matchingSignature(signature=name)]
+      sides = [[edge for edge in self.edgeIndex.get(signature, []) if self.isOpen(edge=edge)] for signature in signatures]
+      forced = None
+      if signatures[0] == signatures[1]:  # edges that connect to their own signature pair up within one list
+        if len(sides[0]) == 2:
+          forced = (sides[0][0], sides[0][1])
+      elif len(sides[0]) == 1 and len(sides[1]) == 1:
+        forced = (sides[0][0], sides[1][0])
+      broke = False
+      for edge in sides[0]:
+        if edge in self.links and (forced is None or edge not in forced):
+          work.extend(self.unlink(edge=edge))
+          broke = True
+      if broke == True:
+        work.extend(self.pending)   # a link that did not fit may fit now
+        self.pending = set()
+        work.append(name)
+        continue
+      if forced is None or forced[0] in self.links:
+        self.pending.discard(name)
+        continue
+      filled = self.link(edge=forced[0], otherEdge=forced[1])
+      if filled is None:
+        self.pending.add(name)
+      else:
+        self.pending.discard(name)
+        work.extend(filled)
+
+  def link(self, edge, otherEdge):
+    """
+    Links two edges, merging their clusters
+
+    Parameters
+    edge: tuple, (piece, side of solvedOrientation)
+    otherEdge: tuple, (piece, side of solvedOrientation) in the group of edge
+
+    Return
+    list, groups of the edges that became filled by the merge, None if the clusters do not fit together
+    """
+    if self.location[edge[0]][0] == self.location[otherEdge[0]][0]:
+      return None   # open edges of one cluster never face each other
+    adjacent = self.merge(piece=edge[0], side=edge[1], other=otherEdge[0], otherSide=otherEdge[1])
+    if adjacent is None:
+      return None
+    self.links[edge] = otherEdge
+    self.links[otherEdge] = edge
+    return [self.group(piece=piece, side=side) for piece, side in adjacent if (piece, side) not in self.links and any(self.solvedEdge(piece=piece, side=side))]
+
+  def unlink(self, edge):
+    """
+    Breaks a link, splitting its cluster in two unless other links still hold it together
+
+    Parameters
+    edge: tuple, (piece, side of solvedOrientation), linked
+
+    Return
+    list, groups of the edges that opened or lost their link
+    """
+    otherEdge = self.links.pop(edge)
+    del self.links[otherEdge]
+    groups = [self.group(piece=edge[0], side=edge[1])]
+    frontiers = [deque([edge[0]]), deque([otherEdge[0]])]
+    seen = [{edge[0]}, {otherEdge[0]}]
+    part = None
+    while part is None:   # searches from both ends in turn, so the cost is the size of the smaller part
+      for search in range(2):
+        if len(frontiers[search]) == 0:
+          part = seen[search]
+          break
+        piece = frontiers[search].popleft()
+        for side in range(4):
+          linked = self.links.get((piece, side))
+          if linked is None or linked[0] in seen[search]:
+            continue
+          if linked[0] in seen[1 - search]:
+            return groups   # still held together, the pair stays next to each other without a link
+          seen[search].add(linked[0])
+          frontiers[search].append(linked[0])
+    oldCluster = self.location[edge[0]][0]
+    self.clusterCount += 1
+    self.clusterPieces[self.clusterCount] = {}
+    for piece in part:
+      cluster, cell, orientation = self.location[piece]
+      del self.clusterPieces[oldCluster][cell]
+      self.clusterPieces[self.clusterCount][cell] = piece
+      self.location[piece][0] = self.clusterCount
+    for piece in part:
+      for side in range(4):
+        if any(self.solvedEdge(piece=piece, side=side)) and self.facingCell(piece=piece, side=side) in self.clusterPieces[oldCluster]:
+          groups.append(self.group(piece=piece, side=side))   # these edges face the other part and are open again
+    return groups
+
+  def merge(self, piece, side, other, otherSide):
+    """
+    Joins the clusters of two pieces whose edges connect, moving the smaller cluster into the frame of the larger one.
+    Nothing changes if the clusters would overlap or put mismatched edges next to each other
+
+    Parameters
+    piece: piece, custom class (see creator.py JigsawPiece)
+    side: integer, side of solvedOrientation that connects
+    other: piece, custom class (see creator.py JigsawPiece), in a different cluster
+    otherSide: integer, side of solvedOrientation of other that connects
+
+    Return
+    list, (piece, side) of both edges of every pair the merge put next to each other, None if not merged
+    """
+    cluster, cell, orientation = self.location[piece]
+    otherCluster, otherCell, otherOrientation = self.location[other]
+    direction = (otherSide + otherOrientation) % 4
+    targetCell = coordinateFromRelativeDirection(coord=otherCell, direction=direction)
+    turns = ((direction + 2 - side) - orientation) % 4  # clockwise turns that line the piece up with other
+    rotated = cell
+    for turn in range(turns):
+      rotated = (rotated[1], -rotated[0])
+    shift = (targetCell[0] - rotated[0], targetCell[1] - rotated[1])
+    if len(self.clusterPieces[cluster]) > len(self.clusterPieces[otherCluster]):   # moves the smaller cluster instead
+      cluster, otherCluster = otherCluster, cluster
+      turns = (4 - turns) % 4
+      for turn in range(turns):
+        shift = (shift[1], -shift[0])
+      shift = (-shift[0], -shift[1])
+    moved = {}
+    for position, movingPiece in self.clusterPieces[cluster].items():
+      for turn in range(turns):
+        position = (position[1], -position[0])
+      moved[(position[0] + shift[0], position[1] + shift[1])] = movingPiece
+    staying = self.clusterPieces[otherCluster]
+    adjacent = []
+    for position, movingPiece in moved.items():
+      if position in staying:
+        return None
+      movingOrientation = (self.location[movingPiece][2] + turns) % 4
+      for direction in range(4):
+        neighbor = staying.get(coordinateFromRelativeDirection(coord=position, direction=direction))
+        if neighbor is not None:
+          movingSide = (direction - movingOrientation) % 4
+          neighborSide = (direction + 2 - self.location[neighbor][2]) % 4
+          edge = self.solvedEdge(piece=movingPiece, side=movingSide)
+          neighborEdge = self.solvedEdge(piece=neighbor, side=neighborSide)
+          if edge != matchingSignature(signature=neighborEdge):
+            return None
+          adjacent.extend([(movingPiece, movingSide), (neighbor, neighborSide)])
+    for position, movingPiece in moved.items():
+      staying[position] = movingPiece
+      self.location[movingPiece] = [otherCluster, position, (self.location[movingPiece][2] + turns) % 4]
+    del self.clusterPieces[cluster]
+    return adjacent
+
+  def clusters(self):
+    """
+    Lists the current assemblies, largest first, rotating every piece to the orientation it is placed in
+
+    Return
+    list, dictionaries of pieces by coordinate (see placeOnCanvas)
+    """
+    assemblies = sorted(self.clusterPieces.values(), key=len, reverse=True)
+    for assembly in assemblies:
+      for piece in assembly.values():
+        if piece.orientation != self.location[piece][2]:
+          piece.rotatePiece((self.location[piece][2] - piece.orientation) % 4)
+    return [dict(assembly) for assembly in assemblies]
+
+def misplacedNeighbors(puzzle, assemblies):
+  """
+  Counts neighboring pieces in assemblies that are not neighbors the same way in the grid of the puzzle they came from.
+  A correct assembly is the grid turned by the orientation its pieces share
+
+  Parameters
+  puzzle: puzzle, custom class (see creator.py Puzzle), with its pieces in the grid they were made in
+  assemblies: list, dictionaries of pieces by coordinate with rotations applied (see IncrementalSolver.clusters)
+
+  Return
+  integer, number of misplaced neighbors (each counted from both sides)
+  """
+  gridCoordinate = {}
+  for line in range(len(puzzle.pieces)):
+    for column in range(len(puzzle.pieces[line])):
+      if puzzle.pieces[line][column].empty == False:
+        gridCoordinate[puzzle.pieces[line][column]] = (column, -line)
+  misplaced = 0
+  for assembly in assemblies:
+    for coordinate, piece in assembly.items():
+      for direction in range(4):
+        neighbor = assembly.get(coordinateFromRelativeDirection(coord=coordinate, direction=direction))
+        if neighbor is None:
+          continue
+        gridDirection = (direction - piece.orientation) % 4
+        if neighbor.orientation != piece.orientation or coordinateFromRelativeDirection(coord=gridCoordinate[piece], direction=gridDirection) != gridCoordinate[neighbor]:
+          misplaced += 1
+  return misplaced
+
+def placeOnCanvas(pieces, pieceSize, bounds=None):
   """
   Creates puzzle from unscambled pieces
 
   Parameters
   pieces: dictionary
+  pieceSize: integer, number of pixels in length/width of piece
+  bounds: tuple, (xMin, yMin, xMax, yMax) of the coordinates when already known (default finds them)
 
   Return
   puzzle, custom class (see creator.py Puzzle), solved puzzle
   """
   coordinates = list(pieces.keys())
-  x = []
-  for coord in coordinates:
-    x.append(coord[0])
-  y = []
-  for coord in coordinates:
-    y.append(coord[1])
-  xMin = min(x)   # crude method for determining bounds of puzzle
-  yMax = max(y)
-  xRange = max(x)-min(x) + 1
-  yRange = max(y)-min(y) + 1
+  if bounds is None:
+    x = []
+    for coord in coordinates:
+      x.append(coord[0])
+    y = []
+    for coord in coordinates:
+      y.append(coord[1])
+    bounds = (min(x), min(y), max(x), max(y))   # crude method for determining bounds of puzzle
+  xMin, yMin, xMax, yMax = bounds
+  xRange = xMax - xMin + 1
+  yRange = yMax - yMin + 1
   if xRange >= yRange:
     tRange = xRange
   else:
     tRange = yRange
+  emptyPiece = JigsawPiece(size=pieceSize, empty=True, lazy=True)   # one empty piece is shared by every empty coordinate
   canvas = [] # creates a canvas with length and width equal to the largest dimension of the puzzle
   for row in range(tRange):
     line = []
     for column in range(tRange):
-      line.append(JigsawPiece(size=pieceSize, empty=True))  # uses empty as default
+      line.append(emptyPiece)  # uses empty as default
     canvas.append(line)
   for c in coordinates:
     canvas[yMax - c[1]][c[0] - xMin] = pieces[c]  # replaces "-" with actual pieces by coordinate
-  return Puzzle(pieceSize=canvas[0][0].pieceSize, puzzleSize=tRange, pieces=canvas, scramble=False)
+  return Puzzle(pieceSize=pieceSize, puzzleSize=tRange, pieces=canvas, scramble=False)
 
+def placeClusters(clusters, pieceSize, gap=1):
+  """
+  Creates puzzle from separately solved clusters, left to right with empty columns between them.
+  Uses the bounds every cluster was solved with, so coordinates are never scanned for them
 
+  Parameters
+  clusters: list, (pieceByLocation, bounds) of every cluster (see clusterSolvePuzzle)
+  pieceSize: integer, number of pixels in length/width of piece
+  gap: integer, number of empty columns between clusters
+
+  Return
+  puzzle, custom class (see creator.py Puzzle), solved puzzle
+  """
+  pieces = {}
+  left = 0
+  height = 0
+  for pieceByLocation, (xMin, yMin, xMax, yMax) in clusters:
+    for coordinate, piece in pieceByLocation.items():
+      pieces[(coordinate[0] - xMin + left, coordinate[1] - yMin)] = piece
+    left += xMax - xMin + 1 + gap
+    height = max(height, yMax - yMin + 1)
+  return placeOnCanvas(pieces=pieces, pieceSize=pieceSize, bounds=(0, 0, left - gap - 1, height - 1))
 
+def main(args=None):
+  parser = argparse.ArgumentParser(description="Creates, scrambles and solves a puzzle")
+  parser.add_argument("--piece-size", type=int, default=20, help="number of pixels in length/width of piece")
+  parser.add_argument("--puzzle-size", type=int, default=20, help="number of pieces in length, width of puzzle")
+  parser.add_argument("--non-square", action=argparse.BooleanOptionalAction, default=True, help="whether any empty coordinates throughout puzzle")
+  parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible puzzle")
+  parser.add_argument("--search", action="store_true", help="backtrack over non-unique edges instead of giving up")
+  parser.add_argument("--max-nodes", type=int, default=1000000, help="most placements the search tries")
+  parser.add_argument("--time-limit", type=float, default=None, help="most seconds the search runs")
+  parser.add_argument("--clusters", action="store_true", help="solve every group of connecting pieces on its own and save them side by side")
+  parser.add_argument("--workers", type=int, default=None, help="number of processes solving clusters in parallel")
+  parser.add_argument("--batch", action="store_true", help="match the open edges of every frontier level at once")
+  parser.add_argument("--stats", action="store_true", help="print timings and counts from the solve")
+  parser.add_argument("--start-path", default="starting_puzzle.png", help="path to output png of the starting puzzle")
+  parser.add_argument("--solved-path", default="solved_puzzle.png", help="path to output png of the solved puzzle")
+  options = parser.parse_args(args)
+  if options.stats == True and options.clusters == True and options.workers is not None and options.workers > 1:
+    parser.error("--stats collects from clusters solved in this process only, leave out --workers")
 
+  p = Puzzle(pieceSize=options.piece_size, puzzleSize=options.puzzle_size, nonSquare=options.non_square, seed=options.seed)
+  p.displaySolved(path=options.start_path)
+  print("Created Puzzle and Scrambled")
+  stats = None
+  if options.stats == True:
+    stats = SolverStats()
+  if options.search == True:
+    pieceByLocation, success = searchSolvePuzzle(puzzle=p, maxNodes=options.max_nodes, timeLimit=options.time_limit, stats=stats)
+  elif options.clusters == True:
+    clusters, success = clusterSolvePuzzle(puzzle=p, workers=options.workers, stats=stats)
+  else:
+    pieceByLocation, success = newSolvePuzzle(puzzle=p, stats=stats, batch=options.batch)
+  if stats is not None:
+    print(json.dumps(stats.summary()))
+  if success == True:
+    print("Solved All Pieces")
+    if options.clusters == True:
+      print("Found " + str(len(clusters)) + " Clusters")
+      final = placeClusters(clusters=clusters, pieceSize=options.piece_size)
+    else:
+      final = placeOnCanvas(pieces=pieceByLocation, pieceSize=options.piece_size)
+    final.displaySolved(path=options.solved_path, type="answer")
+    print("Saved Puzzle To Path")
+  elif options.search == True:
+    print("Failed To Solve: Search Ran Out Of Nodes Or Time")
+  else:
+    print("Failed To Solve: Puzzle Possesses Non-Unique Edges")
 
-pieceSize = 20
-puzzleSize = 20
-startingPuzzlePath = "starting_puzzle.png"
-solvedPuzzlePath = "solved_puzzle.png"
 
-p = Puzzle(pieceSize=pieceSize, puzzleSize=puzzleSize, nonSquare=True)
-p.displaySolved(path=startingPuzzlePath)
-print("Created Puzzle and Scrambled")
-for ip in range(len(p.scrambledPieces)):
-  p.scrambledPieces[ip].determineEdgeIndex()
-print("Determined Edge Indices")
-pieceByLocation, success = newSolvePuzzle(puzzle=p)
-if success == True:
-  print("Solved All Pieces")
-  final = placeOnCanvas(pieces=pieceByLocation)
-  final.displaySolved(path=solvedPuzzlePath, type="answer")
-  print("Saved Puzzle To Path")
-else:
-  print("Failed To Solve: Puzzle Possesses Non-Unique Edges")
\ No newline at end of file
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,174 @@
+import struct
+import numpy as np
+from creator import Puzzle, JigsawPiece
+
+
+magic = b"JGSW"
+version = 1
+headerFormat = "<4sIIIII"   # magic, version, pieceSize, puzzleSize, number of pieces, has solution
+headerSize = 64
+
+
+def sectionOffsets(pieceSize, pieceCount, hasSolution):
+  """
+  Calculates where every array starts in a puzzle file, each aligned to 8 bytes
+
+  Parameters
+  pieceSize: integer, number of pixels in length/width of piece
+  pieceCount: integer, number of coordinates in puzzle (including empty ones)
+  hasSolution: boolean, whether file stores a solution
+
+  Return
+  dictionary, name to (offset, dtype, shape) of every array
+  """
+  sections = [("empty", np.uint8, (pieceCount,)),
+              ("borders", np.int8, (pieceCount, 4, pieceSize)),
+              ("scramble", np.uint32, (pieceCount,)),
+              ("rotations", np.uint8, (pieceCount,))]
+  if hasSolution == True:
+    sections.append(("solution", np.int32, (pieceCount, 3)))
+  offsets = {}
+  offset = headerSize
+  for name, dtype, shape in sections:
+    offsets[name] = (offset, dtype, shape)
+    offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    offset = (offset + 7) // 8 * 8
+  return offsets
+
+def savePuzzle(puzzle, path, solution=None):
+  """
+  Saves a puzzle in a compact binary format that can be memory-mapped (see PuzzleFile).
+  Stores the grid of empty coordinates, the four borders of every piece in its solved orientation,
+  the scramble order, the orientation of every piece when it was scrambled and optionally a solution
+  with the orientation every placed piece was solved in. Unscrambled puzzles are stored in grid order
+
+  Parameters
+  puzzle: puzzle, custom class (see creator.py Puzzle)
+  path: string, path to output file
+  solution: dictionary, pieces by unscrambled coordinate as returned by the solver
+  """
+  size = puzzle.pieceSize
+  grid = [piece for line in puzzle.pieces for piece in line]
+  gridIndex = {}  # empty pieces may be one shared object, so every object keeps a list of its coordinates
+  for index, piece in enumerate(grid):
+    gridIndex.setdefault(id(piece), []).append(index)
+  offsets = sectionOffsets(pieceSize=size, pieceCount=len(grid), hasSolution=solution is not None)
+  arrays = {}
+  for name, (offset, dtype, shape) in offsets.items():
+    arrays[name] = np.zeros(shape, dtype=dtype)
+  for index, piece in enumerate(grid):
+    arrays["empty"][index] = piece.empty
+    if piece.empty == False:
+      arrays["borders"][index] = piece.borders
+  scrambledPieces = getattr(puzzle, "scrambledPieces", grid)
+  scrambleRotations = getattr(puzzle, "scrambleRotations", None)
+  if scrambleRotations is None:   # no record of the scramble, so the pieces must not have been rotated since
+    scrambleRotations = [piece.orientation for piece in scrambledPieces]
+  used = {}
+  for position, piece in enumerate(scrambledPieces):
+    indices = gridIndex[id(piece)]
+    arrays["scramble"][position] = indices[used.get(id(piece), 0)]
+    used[id(piece)] = used.get(id(piece), 0) + 1
+    arrays["rotations"][position] = scrambleRotations[position]
+  if solution is not None:
+    arrays["solution"][:] = (0, 0, -1)  # rotations of -1 marks pieces without a coordinate
+    position = {id(piece): index for index, piece in enumerate(scrambledPieces)}
+    for coordinate, piece in solution.items():
+      arrays["solution"][position[id(piece)]] = (coordinate[0], coordinate[1], piece.orientation)
+  with open(path, "wb") as out:
+    header = struct.pack(headerFormat, magic, version, size, puzzle.puzzleSize, len(grid), solution is not None)
+    out.write(header.ljust(headerSize, b"\0"))
+    for name, (offset, dtype, shape) in offsets.items():
+      out.seek(offset)
+      out.write(arrays[name].tobytes())
+
+
+class PuzzleFile:
+
+  def __init__(self, path):
+    """
+    Opens a saved puzzle (see savePuzzle) with every array memory-mapped read only.
+    Nothing is read until it is used, and processes opening the same file share its pages
+
+    Parameters
+    path: string, path to puzzle file
+    """
+    with open(path, "rb") as puzzleFile:
+      header = struct.unpack(headerFormat, puzzleFile.read(struct.calcsize(headerFormat)))
+    if header[0] != magic or header[1] != version:
+      raise ValueError("Not a version " + str(version) + " puzzle file: " + path)
+    self.path = path
+    self.pieceSize = header[2]
+    self.puzzleSize = header[3]
+    self.pieceCount = header[4]
+    self.solution = None
+    for name, (offset, dtype, shape) in sectionOffsets(self.pieceSize, self.pieceCount, header[5] == 1).items():
+      setattr(self, name, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape))
+
+  def piece(self, index, lazy=False):
+    """
+    Builds one piece of the grid in its solved orientation
+
+    Parameters
+    index: integer, position of piece in the grid (row by row)
+    lazy: boolean, piece keeps only its borders (see creator.py JigsawPiece)
+
+    Return
+    piece, custom class (see creator.py JigsawPiece)
+    """
+    if self.empty[index] == 1:
+      return JigsawPiece(size=self.pieceSize, empty=True, lazy=lazy)
+    return JigsawPiece(size=self.pieceSize, constraints=list(self.borders[index]), lazy=lazy)
+
+  def toPuzzle(self, lazy=False):
+    """
+    Builds the whole puzzle, with scrambled pieces in their saved order and orientation.
+    If a solution was saved, its pieces are turned to the orientation they were solved in
+
+    Parameters
+    lazy: boolean, pieces keep only their borders and empty coordinates share one empty piece (see creator.py Puzzle)
+
+    Return
+    puzzle, custom class (see creator.py Puzzle)
+    dictionary, pieces by unscrambled coordinate (None if no solution was saved)
+    """
+    emptyPiece = None
+    grid = []
+    for index in range(self.pieceCount):
+      if lazy == True and self.empty[index] == 1:
+        if emptyPiece is None:
+          emptyPiece = self.piece(index=index, lazy=True)
+        grid.append(emptyPiece)
+      else:
+        grid.append(self.piece(index=index, lazy=lazy))
+    pieces = []
+    for vertical in range(self.puzzleSize):
+      pieces.append(grid[vertical * self.puzzleSize:(vertical + 1) * self.puzzleSize])
+    puzzle = Puzzle(pieceSize=self.pieceSize, puzzleSize=self.puzzleSize, pieces=pieces, scramble=False, lazy=lazy)
+    puzzle.scrambledPieces = [grid[index] for index in self.scramble]
+    puzzle.scrambleRotations = [int(rotations) for rotations in self.rotations]
+    for piece, rotations in zip(puzzle.scrambledPieces, puzzle.scrambleRotations):
+      if piece.empty == False:
+        piece.rotatePiece(rotations)
+    solution = None
+    if self.solution is not None:
+      solution = {}
+      for piece, (x, y, rotations) in zip(puzzle.scrambledPieces, self.solution):
+        if rotations != -1:
+          piece.rotatePiece((int(rotations) - piece.orientation) % 4)
+          solution[(int(x), int(y))] = piece
+    return puzzle, solution
+
+def loadPuzzle(path, lazy=False):
+  """
+  Loads a saved puzzle (see savePuzzle)
+
+  Parameters
+  path: string, path to puzzle file
+  lazy: boolean, pieces keep only their borders (see creator.py Puzzle)
+
+  Return
+  puzzle, custom class (see creator.py Puzzle)
+  dictionary, pieces by unscrambled coordinate (None if no solution was saved)
+  """
+  return PuzzleFile(path).toPuzzle(lazy=lazy)
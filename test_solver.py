@@ -0,0 +1,51 @@
+import pytest
+from creator import Puzzle
+from solver import clockwiseEdge, coordinateFromRelativeDirection, matchingSignature, newSolvePuzzle, searchSolvePuzzle
+
+
+def unmatchedEdges(pieceByLocation):
+  """
+  Finds every bumped edge of an assembly that does not face a matching edge
+
+  Parameters
+  pieceByLocation: dictionary, pieces by unscrambled coordinate as returned by the solver
+
+  Return
+  list, (cell, side) pairs
+  """
+  unmatched = []
+  for cell, piece in pieceByLocation.items():
+    for direction in range(4):
+      edge = clockwiseEdge(piece=piece, side=direction)
+      if not any(edge):
+        continue
+      neighbor = pieceByLocation.get(coordinateFromRelativeDirection(coord=cell, direction=direction))
+      if neighbor is None or clockwiseEdge(piece=neighbor, side=(direction + 2) % 4) != matchingSignature(signature=edge):
+        unmatched.append((cell, direction))
+  return unmatched
+
+@pytest.mark.parametrize("seed", range(60))
+def test_search_assemblies_have_no_open_edges(seed):
+  puzzle = Puzzle(pieceSize=6, puzzleSize=6, nonSquare=True, seed=seed)   # small pieces repeat edges, so the search branches
+  pieceByLocation, success = searchSolvePuzzle(puzzle=puzzle, maxNodes=5000)
+  if success == True:
+    assert unmatchedEdges(pieceByLocation) == []
+    assert len(pieceByLocation) == sum(1 for piece in puzzle.scrambledPieces if piece.empty == False)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_search_solves_unique_edges(seed):
+  puzzle = Puzzle(pieceSize=16, puzzleSize=6, seed=seed)
+  pieceByLocation, success = searchSolvePuzzle(puzzle=puzzle)
+  assert success == True
+  assert len(pieceByLocation) == 36
+  assert unmatchedEdges(pieceByLocation) == []
+
+@pytest.mark.parametrize("pieceSize, nonSquare, seed", [(8, False, 0), (8, True, 1), (12, True, 2), (20, False, 3), (20, True, 4)])
+def test_batch_places_pieces_like_serial(pieceSize, nonSquare, seed):
+  placements = []
+  for batch in (False, True):
+    puzzle = Puzzle(pieceSize=pieceSize, puzzleSize=15, nonSquare=nonSquare, seed=seed)
+    position = {piece: index for index, piece in enumerate(puzzle.scrambledPieces)}
+    pieceByLocation, success = newSolvePuzzle(puzzle=puzzle, batch=batch)
+    placements.append((success, {cell: (position[piece], piece.orientation) for cell, piece in pieceByLocation.items()}))
+  assert placements[0] == placements[1]